@@ -6,6 +6,8 @@ from discord.ext import commands
 
 import custom_classes as cc
 
+LEADERBOARD_PAGE_SIZE = 10
+
 
 class Contests(cc.KernCog):
     """Contest functions"""
@@ -73,15 +75,20 @@ class Contests(cc.KernCog):
         submissions = await self.bot.database.list_contest_submissions(ctx)
         if not submissions:
             return await ctx.error(f"The server `{ctx.guild.name}` has no contest submissions.", "No submissions")
-        compiled = str()
-        for index, submission in enumerate(submissions, start=1):
-            embed = discord.Embed.from_dict(json.loads(submission['embed']))
-            s_id = submission['submission_id']
-            author = ctx.guild.get_member(submission['owner_id'])
-            rating = submission['rating'] or "NIL"
-            compiled += f"{index}). **{embed.title}** by {author.mention} [id: {s_id}]. **Rating:** `{rating}` points.\n"
         max_points = await self.bot.database.get_max_rating(ctx)
-        await ctx.neutral(compiled, f"Submissions leaderboard for {ctx.guild} [/{max_points}]")
+
+        def format_page(entries, number):
+            compiled = str()
+            for index, submission in enumerate(entries, start=(number - 1) * LEADERBOARD_PAGE_SIZE + 1):
+                embed = discord.Embed.from_dict(json.loads(submission['embed']))
+                s_id = submission['submission_id']
+                author = ctx.guild.get_member(submission['owner_id'])
+                rating = submission['rating'] or "NIL"
+                compiled += f"{index}). **{embed.title}** by {author.mention} [id: {s_id}]. **Rating:** `{rating}` points.\n"
+            return ctx.neutral_embed(compiled, f"Submissions leaderboard for {ctx.guild} [/{max_points}]")
+
+        source = cc.ListPageSource(submissions, LEADERBOARD_PAGE_SIZE, format_page)
+        await cc.Paginator(ctx, source=source).start_paginating()
         return [submission['submission_id'] for submission in submissions]
 
     @commands.guild_only()
@@ -124,11 +131,8 @@ class Contests(cc.KernCog):
                 "No submissions to purge:")
         await ctx.send("Are you sure? [Y/n] This deletes {} submissions".format(length))
 
-        def check(m):
-            return m.author == ctx.author
-
         try:
-            message = await self.bot.wait_for('message', check=check, timeout=30.0)
+            message = await self.bot.waiters.wait_for('message', (ctx.channel.id, ctx.author.id), timeout=30.0)
         except asyncio.TimeoutError:
             return await ctx.send("Time limit to reply exceeded.")
         if 'y' not in message.content.lower():
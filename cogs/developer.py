@@ -1,12 +1,15 @@
-import inspect
 import os
 
 import discord
 from discord.ext import commands
-from fuzzywuzzy import process
 
 import custom_classes as cc
 
+process = cc.lazy_import("fuzzywuzzy.process")
+
+DOCS_FIELDS_PER_PAGE = 5
+DOCS_FIELD_LENGTH = 500
+
 
 class Developer(cc.KernCog):
     """Commands related to discord.py library"""
@@ -35,7 +38,8 @@ class Developer(cc.KernCog):
         # since we found the command we're looking for, presumably anyway, let's
         # try to access the code itself
         src = obj.callback.__code__
-        lines, firstlineno = inspect.getsourcelines(src)
+        source = cc.get_source(src)
+        lines, firstlineno = source.lines, source.firstlineno
         if not obj.callback.__module__.startswith('discord'):
             # not a built-in command
             location = os.path.relpath(src.co_filename).replace('\\', '/')
@@ -58,8 +62,8 @@ class Developer(cc.KernCog):
     @commands.command(aliases=["documentation", "rtfd"])
     async def docs(self, ctx, obj):
         """Displays the documentation for a discord command.
-        e.g `discord.User` is User, and `commands.Bot` is Bot
-        Note this is not paginated and is currently very spammy"""
+        e.g `discord.User` is User, and `commands.Bot` is Bot"""
+        await self.bot.wait_for_dataset("documentation")
         try:
             objs = [o[0] for o in process.extract(obj, self.bot.documentation.keys()) if o[1] > 75]
             obj = self.bot.documentation[obj]
@@ -70,13 +74,31 @@ class Developer(cc.KernCog):
                      [f"[{o}]({self.bot.documentation[o]['url']}])" for o in objs]
                 ))
             return await ctx.error(f"Object `{obj}` does not exist{op}", "No Documentation Found")
-        em = discord.Embed()
-        em.description = f"""
+        description = f"""
 **[*{obj['type']}* {obj['name']}{obj['arguments'].replace('*', '∗')}]({obj["url"]})**
 {obj["description"]}
         """
-        msg = await ctx.send(embed=em)
-        # implement pagination
+
+        def members():
+            for section in ("attributes", "methods", "classmethods", "operations"):
+                for name, text in obj.get(section, {}).items():
+                    yield section, name, text
+
+        def format_page(entries, number):
+            em = discord.Embed()
+            if number == 1:
+                em.description = description
+            else:
+                em.title = obj["name"]
+                em.url = obj["url"]
+            for section, name, text in entries:
+                em.add_field(name=f"{section[:-1].title()}: {name}",
+                             value=(text or "No description.")[:DOCS_FIELD_LENGTH],
+                             inline=False)
+            return em
+
+        source = cc.IteratorPageSource(members(), DOCS_FIELDS_PER_PAGE, format_page)
+        await cc.Paginator(ctx, source=source).start_paginating()
 
 
 def setup(bot):
@@ -41,12 +41,10 @@ class Dictionary(cc.KernCog):
 
     async def _get_dic_request(self, url):
         with async_timeout.timeout(10):
-            async with self.bot.session.get(
-                    url, headers=self.headers) as response:
-                if not response.status == 200:
-                    return
-                r_json = await response.json()
-                return r_json['results']
+            response = await self.bot.http_client.get(url, headers=self.headers, cache=True)
+        if not response.status == 200:
+            return
+        return response.json()['results']
 
     async def _word_not_found(self, term):
         results = await self._get_dic_request(
@@ -22,6 +22,7 @@ class Errors(cc.KernCog):
     @commands.Cog.listener()
     async def on_command_error(self, ctx: cc.KernContext, error):
         error = getattr(error, "original", error)
+        self.bot.metrics.inc("kern_command_errors_total", error=type(error).__name__)
 
         ignored = (commands.NotOwner, commands.CommandNotFound, discord.Forbidden)
 
@@ -69,6 +70,10 @@ class Errors(cc.KernCog):
         elif isinstance(error, asyncio.TimeoutError):
             await ctx.error("The internet is gone?!?!?!?", "Timeout Error")
 
+        elif isinstance(error, cc.UpstreamUnavailable):
+            await ctx.error(f"`{error.host}` isn't responding right now, try again in a minute.",
+                            "Service Unavailable")
+
         elif isinstance(error, commands.CommandOnCooldown):
             if await self.bot.is_owner(ctx.author):
                 print(f"Owner reinvoked {ctx.command.qualified_name} "
@@ -82,20 +87,29 @@ class Errors(cc.KernCog):
             # add more detailed debug
             await ctx.error(f"**This error is now known about 👍**\n```{error}```", type(error).__qualname__)
 
+            stats, report = self.bot.error_aggregator.record(error, ctx.command)
+            if not report:
+                return
+
             traceback.print_exception(type(error), error, error.__traceback__)
-            await self.bot.logs.send("""
+            self.bot.log_sink.log("""
 **Command:** {}
 **Error:** {}
 **Member: ** {}
 **Guild: ** {}
+**Fingerprint:** `{}` ({} times since the last sample, {} in total)
 ```py\n{}```
             """.format(ctx.command,
                        type(error).__qualname__,
                        ctx.author,
-                       ctx.guild, "".join(traceback.format_exception(type(error),
-                                                                     error,
-                                                                     error.__traceback__)
-                                          )))
+                       ctx.guild,
+                       stats.fingerprint, stats.unreported, stats.count,
+                       "".join(traceback.format_exception(type(error),
+                                                          error,
+                                                          error.__traceback__)
+                               )),
+                                  title=f"{type(error).__qualname__} in {ctx.command}")
+            self.bot.error_aggregator.reported(stats)
 
             if self.bot.testing:
                 async with aiofiles.open("error.html", mode="w", encoding="utf-8") as f:
@@ -24,24 +24,19 @@ class Games(cc.KernCog):
     def __init__(self, bot: cc.KernBot):
         self.bot = bot
 
-    async def add_reactions(self, message, number):
-        for index in range(number):
-            await message.add_reaction(EMOJIS[index + 1])
-        await message.add_reaction("⏹")
-
     async def get_trivia_results(self, category=None):
         results = []
         if category is None:
             url = TRIVIA_URL
         else:
+            await self.bot.wait_for_dataset("trivia_categories")
             category_id = self.bot.trivia_categories.get(category.lower())
             if category_id is None:
                 raise ValueError(f"Category `{category}` does not exist.")
             url = f"{TRIVIA_URL}&category={category_id}"
 
         with async_timeout.timeout(10):
-            async with self.bot.session.get(url) as resp:
-                raw_results = (await resp.json())['results']
+            raw_results = (await self.bot.http_client.get_json(url, coalesce=False, hedge=True))['results']
 
         for r in raw_results:
             d = {}
@@ -81,17 +76,19 @@ class Games(cc.KernCog):
 
             msg = await ctx.send(embed=e, delete_after=20)
 
-            def same(reaction, member):
-                return ctx.message.author == member and reaction.emoji in list(
-                    EMOJIS.values()) + ["⏹"] and reaction.message.id == msg.id
+            def same(reaction, _):
+                return reaction.emoji in list(EMOJIS.values()) + ["⏹"]
 
-            self.bot.loop.create_task(self.add_reactions(msg, len(answers)))
+            placing = self.bot.reaction_placer.place(msg, [EMOJIS[i + 1] for i in range(len(answers))] + ["⏹"])
 
             try:
-                reaction, _ = await self.bot.wait_for("reaction_add", check=same, timeout=15)
+                reaction, _ = await self.bot.waiters.wait_for("reaction_add", (msg.id, ctx.author.id),
+                                                              check=same, timeout=15)
             except asyncio.TimeoutError:
                 await ctx.error("You took too long to add an emoji.", "Timeout")
                 break
+            finally:
+                placing.cancel()
 
             if str(reaction) == "⏹":
                 return ctx.command.reset_cooldown(ctx)
@@ -119,6 +116,7 @@ class Games(cc.KernCog):
     @trivia.command(name="list")
     async def trivia_list(self, ctx):
         """Gives a list of possible categories usable with the trivia command"""
+        await self.bot.wait_for_dataset("trivia_categories")
         cat_string = ""
         for category in self.bot.trivia_categories:
             cat_string += f"{category.title()}\n"
@@ -5,17 +5,18 @@ from collections import OrderedDict
 from datetime import datetime
 from random import sample
 
-import aiogoogletrans
 import aiohttp
 import async_timeout
 import discord
-from bs4 import BeautifulSoup
 from discord.ext import commands
-from fuzzywuzzy import process
-from tabulate import tabulate
 
 import custom_classes as cc
 
+aiogoogletrans = cc.lazy_import("aiogoogletrans")
+bs4 = cc.lazy_import("bs4")
+process = cc.lazy_import("fuzzywuzzy.process")
+tabulate = cc.lazy_import("tabulate")
+
 PROTOCOLS = ['ssh', 'smb', 'smtp', 'ftp', 'imap', 'http', 'https', 'pop', 'htcpcp', 'telnet', 'tcp', 'ipoac']
 TABLE_HEADERS = ["PORT", "PROTOCOL", "SECURE"]
 
@@ -25,7 +26,7 @@ def gen_data():
     protocols = random.sample(PROTOCOLS, len(fake_ports))
     secured = [random.choice(["'false'", 'true']) for i in fake_ports]
     table_data = list(zip(fake_ports, protocols, secured))
-    table = str(tabulate(table_data, TABLE_HEADERS, tablefmt="rst"))
+    table = str(tabulate.tabulate(table_data, TABLE_HEADERS, tablefmt="rst"))
     open_data = [data[0:3] for data in table_data if data[2]]
     open_ports = ", ".join([str(data[0]) for data in open_data if data[2] == "true"])
     return table_data, table, open_ports, open_data
@@ -36,15 +37,21 @@ class Internet(cc.KernCog):
 
     def __init__(self, bot: cc.KernBot):
         self.bot = bot
-        self.translator = aiogoogletrans.Translator()
+        self._translator = None
+
+    @property
+    def translator(self):
+        if self._translator is None:
+            self._translator = aiogoogletrans.Translator()
+        return self._translator
 
     async def get_youtube_videos(self, page_url, cutoff_length=80, result_length=5):
         results = OrderedDict()
         vids = []
 
         with async_timeout.timeout(10):
-            async with self.bot.session.get(page_url) as resp:
-                soup = BeautifulSoup((await resp.read()).decode('utf-8'), "lxml")
+            resp = await self.bot.http_client.get(page_url, cache=True, hedge=True)
+        soup = bs4.BeautifulSoup(resp.text(), "lxml")
 
         for link in soup.find_all('a', href=True):
             url = link.get('href', "")
@@ -100,6 +107,7 @@ class Internet(cc.KernCog):
         Without a search_term specified a random result is returned."""
         async with ctx.typing():
             search_term = search_term.lower()
+            await self.bot.wait_for_dataset("demotivators")
             demotivators = self.bot.demotivators
             if search_term:
                 dem = demotivators.get(search_term)
@@ -133,13 +141,14 @@ class Internet(cc.KernCog):
 
         msg = await ctx.send(f"Looking for open ports in <{url}>")
         content = msg.content
-        await msg.edit(content=f"{content}\nPort: {th}{hu}{te}{on}{loading}")
+        await ctx.edit(msg, content=f"{content}\nPort: {th}{hu}{te}{on}{loading}")
         await asyncio.sleep(10)
 
         if not open_ports:
-            return await msg.edit(content=f":x: Port scan complete. No insecure ports found.")
+            return await ctx.edit(msg, content=f":x: Port scan complete. No insecure ports found.")
 
-        await msg.edit(
+        await ctx.edit(
+            msg,
             content=
             f"Port scan complete. Scan report: ```ml\n{table}```\n{loading}Attempting to bruteforce insecure ports: ({open_ports})"
         )
@@ -148,19 +157,18 @@ class Internet(cc.KernCog):
 
     async def create_video(self, text):
         with async_timeout.timeout(10):
-            async with self.bot.session.post(
-                    url="http://talkobamato.me/synthesize.py", data={"input_text": text}) as resp:
-                if resp.status >= 400:
-                    raise discord.HTTPException(resp, f"{resp.url} returned error code {resp.status}")
-                url = resp.url
+            resp = await self.bot.http_client.post("http://talkobamato.me/synthesize.py", data={"input_text": text})
+            if resp.status >= 400:
+                raise discord.HTTPException(resp, f"{resp.url} returned error code {resp.status}")
+            url = resp.url
 
         key = url.query['speech_key']
         link = f"http://talkobamato.me/synth/output/{key}/obama.mp4"
         await asyncio.sleep(len(text) // 5)
         with async_timeout.timeout(10):
-            async with self.bot.session.get(link) as resp:
-                if resp.status >= 400:
-                    raise discord.HTTPException(resp, f"{resp.url} returned error code {resp.status}")
+            resp = await self.bot.http_client.get(link, coalesce=False)
+            if resp.status >= 400:
+                raise discord.HTTPException(resp, f"{resp.url} returned error code {resp.status}")
         return link
 
     @commands.cooldown(1, 10, commands.BucketType.user)
@@ -201,14 +209,16 @@ class Internet(cc.KernCog):
                 translation = await self.translator.translate(text, dest=language)
                 text = translation.text
 
+            file = None
             if len(text) > 1900:
-                text = await ctx.upload(text)
+                paste = await ctx.upload(text)
+                text, file = paste.link or "attached", paste.file
             else:
                 text = f"```{text}```"
 
             await ctx.send(f"""**User:** {ctx.author.display_name}
 **Languages:** ```{" > ".join(aiogoogletrans.LANGUAGES[l] for l in languages)}```
-**Result:** {text}""")
+**Result:** {text}""", file=file)
 
     @translate.error
     async def translate_error_handler(self, ctx, error):
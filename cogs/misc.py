@@ -7,10 +7,11 @@ import async_timeout
 import discord
 import psutil
 from discord.ext import commands
-from pkg_resources import get_distribution
 
 import custom_classes as cc
 
+pkg_resources = cc.lazy_import("pkg_resources")
+
 COUNTRY_CODES = {
     "AU": "Australia",
     "BR": "Brazil",
@@ -107,9 +108,7 @@ class Misc(cc.KernCog):
     async def person(self, ctx):
         """Generates a random person"""
         with async_timeout.timeout(10):
-            async with self.bot.session.get(
-                    "https://randomuser.me/api/?noinfo") as resp:
-                data = (await resp.json())['results'][0]
+            data = (await self.bot.http_client.get_json("https://randomuser.me/api/?noinfo", coalesce=False))['results'][0]
         names = data['name']
         name = "{} {} {}".format(names['title'].capitalize(),
                                  names['first'].capitalize(),
@@ -216,14 +215,14 @@ class Misc(cc.KernCog):
 
 **Bot Details**
 <:channels:432082250465804289> **Channels** {sum(1 for _ in self.bot.get_all_channels())}
-<:servers:432077842285854720> **Servers** {len(self.bot.guilds)}
-<:members:432082250436444162> **Members** {sum(1 for _ in self.bot.get_all_members())} 
+<:servers:432077842285854720> **Servers** {self.bot.guild_count}
+<:members:432082250436444162> **Members** {self.bot.member_count} 
 <:ram:432080886985654273> **RAM Usage** {self.process.memory_full_info().uss / 1024**2} MB
 <:cpu:432077839228076033> **CPU Usage** {self.process.cpu_percent() / psutil.cpu_count()} % 
 <:uptime:432082654335336457> **Uptime** {self.uptime}
 <:python:416194389853863939> **Python** {python_version()}
-<:discord:416194942520786945> **Discord.py** {get_distribution('discord.py').version}
-<:git:417177301244051525> **Git** {self.bot.latest_commit} [Up-To-Date: {self.bot.latest_commit == get_distribution('discord.py').version.split("+")[1]}]
+<:discord:416194942520786945> **Discord.py** {pkg_resources.get_distribution('discord.py').version}
+<:git:417177301244051525> **Git** {self.bot.latest_commit} [Up-To-Date: {self.bot.latest_commit == pkg_resources.get_distribution('discord.py').version.split("+")[1]}]
 """
         embed.add_field(name="Links", value=(f"[Invite URL]({self.bot.invite_url})\n"
                                              f"[Server Invite](https://discord.gg/nHmAkgg)\n"
@@ -16,6 +16,8 @@ ANNOUNCEMENT_FOOTER = "\n\n*This is an automated message sent by the bot's " \
                       "might cause issues in the operation of this bot in " \
                       "your server. Please feel free to send this " \
                       "announcement to the rest of your server*"
+ERRORS_PER_PAGE = 5
+ERROR_ENTRY_LIMIT = 400
 
 
 class Owner(cc.KernCog):
@@ -26,6 +28,10 @@ class Owner(cc.KernCog):
         self.hidden = True
         self._last_result = None
 
+        if bot.cluster is not None:
+            bot.cluster.add_handler("announce", self.send_announcement)
+            bot.cluster.add_handler("shutdown", self.bot.close)
+
     async def cog_check(self, ctx):
         return await self.bot.is_owner(ctx.author)
 
@@ -40,6 +46,8 @@ class Owner(cc.KernCog):
     async def shutdown(self, ctx):
         """Owner of this bot only command; Shutdown the bot"""
         await ctx.success("", f"Shutting Down @ {datetime.utcnow().strftime('%H:%M:%S')}", rqst_by=False)
+        if self.bot.cluster is not None:
+            await self.bot.cluster.broadcast("shutdown")
         await self.bot.close()
 
     @commands.guild_only()
@@ -49,9 +57,7 @@ class Owner(cc.KernCog):
         await ctx.success(f"Leaving `{ctx.guild.name}`")
         await ctx.guild.leave()
 
-    @commands.command(hidden=True)
-    async def announce(self, ctx, *, message):
-        """Sends a message to all server owners"""
+    async def send_announcement(self, message):
         for guild in self.bot.guilds:
             if "discord" in guild.name.lower():
                 continue
@@ -61,8 +67,88 @@ class Owner(cc.KernCog):
             except discord.Forbidden:
                 pass
 
+    @commands.command(hidden=True)
+    async def announce(self, ctx, *, message):
+        """Sends a message to all server owners"""
+        if self.bot.cluster is not None:
+            await self.bot.cluster.broadcast("announce", message=message)
+        await self.send_announcement(message)
+
         await ctx.send("Success.")
 
+    @commands.command(hidden=True)
+    async def datasets(self, ctx):
+        """Shows when each data set was last refreshed, how long it took and any failures"""
+        lines = []
+        for dataset in self.bot.dataset_scheduler.datasets.values():
+            if dataset.last_refresh is None:
+                line = f"**{dataset.name}:** not refreshed since start-up"
+            else:
+                line = f"**{dataset.name}:** refreshed {dataset.last_refresh.strftime('%H:%M:%S')}"
+            if dataset.last_duration is not None:
+                line += f" in {dataset.last_duration:.2f}s"
+            line += f", {dataset.refreshes} refreshes, {dataset.failures} failures"
+            if dataset.last_error:
+                line += f"\n`{dataset.last_error}`"
+            lines.append(line)
+        await ctx.neutral("\n".join(lines), "Data Sets")
+
+    @commands.command(hidden=True)
+    async def servercount(self, ctx):
+        """Shows when the server count was last posted to discordbots.org"""
+        publisher = self.bot.server_count_publisher
+        if not publisher.enabled:
+            return await ctx.neutral("Server count isn't posted by this cluster", "Server Count")
+        if publisher.last_publish is None:
+            return await ctx.neutral("Not posted since start-up", "Server Count")
+        text = f"Last posted {publisher.last_publish.strftime('%H:%M:%S')}, " \
+               f"{publisher.publishes} posts since start-up, latest count {publisher.last_count}"
+        if publisher.last_error:
+            text += f"\nLast attempt failed: `{publisher.last_error}`"
+        await ctx.neutral(text, "Server Count")
+
+    @commands.command(hidden=True)
+    async def startup(self, ctx):
+        """Shows how long each phase of start-up took"""
+        timeline = self.bot.startup_timeline
+        lines = []
+        for phase in sorted(timeline.phases, key=lambda p: p["start"]):
+            memory = ""
+            if phase["memory_delta"] is not None:
+                memory = f"{phase['memory_delta'] / 1024 ** 2:+.1f}MB"
+            lines.append(f"{phase['name']:<32} {phase['start']:>8.2f}s {phase['duration']:>7.2f}s {memory:>9}")
+        for name, at in timeline.marks.items():
+            lines.append(f"{name:<32} {at:>8.2f}s")
+        await ctx.send("```{}\n{}```".format(f"{'PHASE':<32} {'AT':>9} {'TOOK':>8} {'MEMORY':>9}", "\n".join(lines)))
+
+    @commands.command(hidden=True)
+    async def imports(self, ctx):
+        """Shows how long each lazily imported module took to import"""
+        times = sorted(cc.IMPORT_TIMES.items(), key=lambda x: x[1], reverse=True)
+        report = "\n".join(f"{name:<20} {seconds * 1000:>8.1f}ms" for name, seconds in times)
+        await ctx.neutral(f"```{report or 'Nothing imported yet'}```", "Import Times")
+
+    @commands.command(hidden=True)
+    async def errors(self, ctx, limit: int = 10):
+        """Shows the most frequent unhandled errors since start-up"""
+        lines = []
+        for stats in self.bot.error_aggregator.top(limit):
+            line = (f"`{stats.fingerprint}` **{stats.name}** x{stats.count} "
+                    f"({', '.join(sorted(stats.commands)) or 'no command'})\n"
+                    f"{stats.frame}\n"
+                    f"first {stats.first_seen.strftime('%d/%m %H:%M:%S')}, "
+                    f"last {stats.last_seen.strftime('%d/%m %H:%M:%S')}")
+            # So a page of them always fits in an embed's description
+            lines.append(line if len(line) <= ERROR_ENTRY_LIMIT else line[:ERROR_ENTRY_LIMIT - 3] + "...")
+        if not lines:
+            return await ctx.neutral("No errors since start-up", "Top Errors")
+
+        def format_page(entries, number):
+            return ctx.neutral_embed("\n".join(entries), f"Top Errors ({number}/{source.page_count})")
+
+        source = cc.ListPageSource(lines, ERRORS_PER_PAGE, format_page)
+        await cc.Paginator(ctx, source=source).start_paginating()
+
     @commands.command(hidden=True, name="eval", aliases=['exec'])
     async def k_eval(self, ctx, *, body: str):
         """Evaluates code"""
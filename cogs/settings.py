@@ -26,26 +26,29 @@ class Settings(cc.KernCog):
     async def set_prefix(self, ctx, *, prefix: str):
         """Set the bot's prefix for this server"""
         prefix = prefix.strip("'").strip('"')
-        self.bot.prefixes_cache.pop(ctx.guild.id, None)
         await ctx.send("Adding prefix `{}`".format(
             await self.bot.database.add_prefix(ctx, prefix)))
+        # Rebuild from the database rather than editing the cached matcher, which the
+        # NOTIFY refresh replaces and which may not exist yet for this guild
+        await self.bot.database.refresh_prefixes(ctx.guild.id)
 
     @_set.command()
     async def remove_prefix(self, ctx, *, prefix: str):
         """Remove the bot's prefix"""
-        try:
-            self.bot.prefixes_cache.get(ctx.guild.id, []).remove(prefix)
-        except ValueError:
+        matcher = self.bot.prefixes_cache.get(ctx.guild.id)
+        if matcher is None or prefix not in matcher.prefixes:
             return await ctx.error(f"Prefix `{prefix}` does not exist.",
                                    "")
 
         await self.bot.database.remove_prefix(ctx, prefix)
+        await self.bot.database.refresh_prefixes(ctx.guild.id)
         await ctx.success(f"Prefix {prefix} successfully removed.")
 
     @get.command(name="prefixes")
     async def get_prefixes(self, ctx):
         """Get the bot's prefix for this server"""
-        prefixes = self.bot.prefixes_cache.get(ctx.guild.id) or [ctx.clean_prefix()]
+        matcher = self.bot.prefixes_cache.get(ctx.guild.id)
+        prefixes = (matcher.prefixes if matcher else None) or [ctx.clean_prefix()]
         await ctx.send("Prefixes for {}: ```{}```".format(
             ctx.guild.name, ", ".join(prefixes)))
 
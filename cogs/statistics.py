@@ -4,17 +4,21 @@ from datetime import datetime, timedelta
 from inspect import Parameter
 
 import async_timeout
-import matplotlib
-
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-from fuzzywuzzy import process
 
 import discord
 from discord.ext import commands
 
 import custom_classes as cc
 
+
+def use_agg_backend():
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+plt = cc.lazy_import("matplotlib.pyplot", setup=use_agg_backend)
+process = cc.lazy_import("fuzzywuzzy.process")
+
 ICON_CODES = {
     1 : "☀",
     2 : "🌙",
@@ -57,15 +61,15 @@ class Statistics(cc.KernCog):
         self.bot = bot
 
     async def get_data(self, time_period, coin, currency, limit):
+        await self.bot.wait_for_dataset("coins")
         if self.bot.crypto['market_price'].get(coin) is None or \
                 self.bot.crypto['market_price'][coin].get(currency) is None or \
                 self.bot.crypto['market_price'][coin][currency].get(time_period) is None or \
                 self.bot.crypto['market_price'][coin][currency][time_period]['timestamp'] < datetime.utcnow():
             with async_timeout.timeout(10):
-                async with self.bot.session.get(
-                        f"https://min-api.cryptocompare.com/data/histo{time_period}?fsym={coin}&tsym={currency}&limit={limit}"
-                ) as resp:
-                    js = await resp.json()
+                js = await self.bot.http_client.get_json(
+                    f"https://min-api.cryptocompare.com/data/histo{time_period}?fsym={coin}&tsym={currency}&limit={limit}",
+                    cache=True, hedge=True)
             if js['Response'] != "Success":
                 raise cc.CoinError(js['Message'], coin, currency, limit)
             vals = js['Data']
@@ -171,7 +175,7 @@ Full name support is incoming.""",
                 await ctx.error(f"Limit `{error.limit}` is not a number.", "")
             else:
                 await ctx.error(f"Un unknown error has occurred.", "")
-                await self.bot.logs.send(repr(error))
+                self.bot.log_sink.log(repr(error), title="Unknown coin error")
         elif isinstance(error, commands.MissingRequiredArgument):
             await ctx.error(str(error), "Missing Argument")
 
@@ -182,6 +186,7 @@ Full name support is incoming.""",
     @commands.command(hidden=True)
     async def auforecast(self, ctx, *, location):
         # add weekdays, then RADAR images, and current temp etc.
+        await self.bot.wait_for_dataset("forecast")
         try:
             loc = self.bot.forecast[location.lower()]
         except KeyError:
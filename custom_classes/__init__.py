@@ -1,9 +1,31 @@
 from .api_requests import *
 from .ast_error_creator import Ast
+from .circuit_breaker import CircuitBreaker
+from .cluster import ClusterClient
+from .command_chain import CHAIN_SEPARATOR, CommandChain
 from .data_classes import *
 from .database import Database
+from .dataset_scheduler import DatasetScheduler
 from .documentation import CreateDocumentation
-from .kern_bot import KernBot
+from .error_aggregator import ErrorAggregator
+from .gateway_stats import GatewayStats
+from .help_index import HelpEntry, HelpIndex
+from .http_client import FetchedResponse, HTTPClient
+from .kern_bot import KernBot, ShardedKernBot
 from .kern_classes import *
+from .lazy_modules import IMPORT_TIMES, lazy_import, load_lazy_modules
+from .log_sink import LogSink
+from .metrics import Metrics
+from .outbound_queue import OutboundQueue
+from .page_source import EmbedPageSource, IteratorPageSource, ListPageSource, PageSource
 from .paginator import Paginator
+from .paste_store import Paste, PasteStore, create_paste_store
+from .prefix_matcher import PrefixMatcher
+from .reaction_placer import ReactionPlacer
+from .response_cache import ResponseCache
+from .server_count_publisher import ServerCountPublisher
+from .snapshot import DATASET_TTLS, Snapshot
+from .source_index import SourceEntry, get_source
+from .startup_timeline import StartupTimeline
 from .utils import *
+from .waiter_registry import WaiterRegistry
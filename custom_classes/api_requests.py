@@ -3,7 +3,10 @@ from xml.etree.ElementTree import fromstring
 
 import xmljson
 from async_timeout import timeout
-from bs4 import BeautifulSoup
+
+from .lazy_modules import lazy_import
+
+bs4 = lazy_import("bs4")
 
 XML_PARSER = xmljson.GData(dict_type=dict)
 DEMOTIVATOR_URL = "https://despair.com/collections/posters"
@@ -28,16 +31,22 @@ WEATHER_XML = [
 ]
 
 
-async def get_demotivators(session):
-    demotivators = {}
-
+async def get_demotivators(session, loop=None):
     try:
         async with timeout(10):
             async with session.get(DEMOTIVATOR_URL) as r:
-                soup = BeautifulSoup((await r.read()).decode("utf-8"), "lxml")
+                text = (await r.read()).decode("utf-8")
     except asyncio.TimeoutError:
         return {}
 
+    # Parsed off the event loop so a refresh doesn't hold up the gateway
+    loop = loop or asyncio.get_event_loop()
+    return await loop.run_in_executor(None, parse_demotivators, text)
+
+
+def parse_demotivators(text):
+    demotivators = {}
+    soup = bs4.BeautifulSoup(text, "lxml")
     for div in soup.find_all("div", {"class": "column"}):
         if div.a and div.a.div:
             a = div.a
@@ -0,0 +1,47 @@
+from time import monotonic
+
+from .data_classes import UpstreamUnavailable
+
+
+class CircuitBreaker:
+    """Fails requests to a host straight away once it has failed `failure_threshold` times in a row.
+    After `reset_timeout` seconds a single trial request is let through, closing it again on success"""
+
+    def __init__(self, host, failure_threshold=5, reset_timeout=30):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trial_running = False
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def before_request(self):
+        state = self.state
+        if state == "open" or (state == "half-open" and self.trial_running):
+            raise UpstreamUnavailable(self.host)
+        if state == "half-open":
+            self.trial_running = True
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.trial_running = False
+
+    def record_failure(self):
+        self.failures += 1
+        # A failed trial re-opens the circuit for another reset_timeout
+        if self.failures >= self.failure_threshold or self.trial_running:
+            self.opened_at = monotonic()
+        self.trial_running = False
+
+    def release_trial(self):
+        """For a trial request that was cancelled, so the next one can try instead"""
+        self.trial_running = False
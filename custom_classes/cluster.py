@@ -0,0 +1,100 @@
+import asyncio
+import json
+
+IPC_HOST = "127.0.0.1"
+# How often each worker reports its counts, which change without a guild join or leave
+STATS_INTERVAL = 60
+RECONNECT_DELAY = 5
+
+
+def encode(op, **data):
+    return json.dumps({"op": op, **data}).encode("utf-8") + b"\n"
+
+
+class ClusterClient:
+    """A worker process' connection to the cluster supervisor (see launcher.py)"""
+
+    def __init__(self, bot, cluster_id, port):
+        self.bot = bot
+        self.cluster_id = cluster_id
+        self.port = port
+        self.reader = None
+        self.writer = None
+        self.closed = False
+
+        # Latest totals across every cluster, sent by the supervisor
+        self.totals = {}
+        self.handlers = {}
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(IPC_HOST, self.port)
+        self.bot.loop.create_task(self.run())
+        self.bot.loop.create_task(self.publish_periodically())
+
+    async def run(self):
+        """Listens to the supervisor, reconnecting whenever the connection drops"""
+        while not self.closed:
+            await self.listen()
+            if self.closed:
+                return
+            print(f"Cluster {self.cluster_id} lost its supervisor connection, reconnecting")
+            self.writer.close()
+            self.writer = None
+            while not self.closed:
+                await asyncio.sleep(RECONNECT_DELAY)
+                try:
+                    self.reader, self.writer = await asyncio.open_connection(IPC_HOST, self.port)
+                    break
+                except OSError:
+                    pass
+
+            # The supervisor only learns who's connected from what they send
+            if self.writer is not None and self.bot.is_ready():
+                await self.bot.publish_cluster_stats()
+
+    async def send(self, op, **data):
+        if self.writer is None:
+            raise ConnectionError(f"Cluster {self.cluster_id} isn't connected to the supervisor")
+        self.writer.write(encode(op, cluster=self.cluster_id, **data))
+        await self.writer.drain()
+
+    async def publish_stats(self):
+        await self.send("stats",
+                        guilds=len(self.bot.guilds),
+                        members=sum(1 for _ in self.bot.get_all_members()))
+
+    async def publish_periodically(self):
+        while not self.bot.is_closed():
+            await asyncio.sleep(STATS_INTERVAL)
+            if self.bot.is_ready():
+                await self.bot.publish_cluster_stats()
+
+    async def broadcast(self, command, **kwargs):
+        """Runs the handler registered for `command` on every other cluster"""
+        await self.send("broadcast", command=command, kwargs=kwargs)
+
+    def add_handler(self, command, coro):
+        self.handlers[command] = coro
+
+    async def listen(self):
+        while True:
+            try:
+                line = await self.reader.readline()
+            except ConnectionError:
+                return
+            if not line:
+                return
+
+            data = json.loads(line)
+            if data["op"] == "totals":
+                self.totals = data
+                self.bot.server_count_publisher.notify()
+            elif data["op"] == "broadcast":
+                handler = self.handlers.get(data["command"])
+                if handler is not None:
+                    self.bot.loop.create_task(handler(**data["kwargs"]))
+
+    def close(self):
+        self.closed = True
+        if self.writer is not None:
+            self.writer.close()
@@ -0,0 +1,63 @@
+import asyncio
+from copy import copy
+
+from .kern_classes import KernContext
+
+CHAIN_SEPARATOR = " && "
+
+
+class CommandChain:
+    """A message of `&&` separated commands, parsed once into the contexts to invoke"""
+
+    def __init__(self, message):
+        self.message = message
+        self.segments = message.content.split(CHAIN_SEPARATOR)
+        self.contexts = []
+        self.failed = {}
+        self.ctx = None
+
+    @classmethod
+    async def from_message(cls, bot, message):
+        chain = cls(message)
+        seen = set()
+
+        for content in chain.segments:
+            # Each segment gets its own message so the original is never mutated
+            segment = copy(message)
+            segment.content = content
+            ctx = chain.ctx = await bot.get_context(segment, cls=KernContext)
+            if ctx.prefix is None:
+                continue
+
+            command = content[len(ctx.prefix):].strip()
+            if not ctx.valid:
+                chain.failed[command] = "Command not found."
+            elif command in seen:
+                chain.failed[command] = "This command has been at least once before."
+            else:
+                seen.add(command)
+                chain.contexts.append(ctx)
+
+        return chain
+
+    async def invoke(self, bot, concurrency=1):
+        """Invokes the chain in order, or up to `concurrency` segments at once"""
+        if concurrency <= 1:
+            for ctx in self.contexts:
+                await bot.invoke(ctx)
+            return
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def invoke_one(ctx):
+            async with semaphore:
+                await bot.invoke(ctx)
+
+        await asyncio.gather(*[invoke_one(ctx) for ctx in self.contexts])
+
+    async def report_failures(self):
+        if self.failed and len(self.failed) != len(self.segments):
+            errors = ""
+            for fail, reason in self.failed.items():
+                errors += f"{fail}: {reason}\n"
+            await self.ctx.error(f"```{errors}```", "These failed to run:")
@@ -48,5 +48,13 @@ class AlreadySubmitted(Exception):
     pass
 
 
+class UpstreamUnavailable(Exception):
+    def __init__(self, host):
+        self.host = host
+
+    def __str__(self):
+        return f"{self.host} is not responding"
+
+
 def upper(argument):
     return argument.upper()
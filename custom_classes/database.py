@@ -2,6 +2,7 @@ import asyncio
 import json
 import os
 import ssl
+import traceback
 from random import randint
 from socket import gaierror
 
@@ -34,6 +35,11 @@ servers_table = """
                 )
                 """
 
+# Sent with a guild id whenever its prefixes change, so every process sharing the db can refresh its cache
+PREFIXES_CHANNEL = "prefixes_changed"
+# How often the connection listening for that is checked, and reconnected if it dropped
+LISTENER_CHECK_INTERVAL = 30
+
 
 class DudPool:
     _closed = True
@@ -48,20 +54,30 @@ class Database:
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.ready = False
+        self.prefixes_loaded = False
         self.dsn = os.environ["DATABASE_URL"]
 
         self.pool = None
+        self.listener = None
+        self.listener_task = None
+        self.ssl_object = ssl.create_default_context()
+        self.ssl_object.check_hostname = False
+        self.ssl_object.verify_mode = ssl.CERT_NONE
         if __name__ in '__main__':
             asyncio.get_event_loop().run_until_complete(self.init())
         else:
             bot.loop.create_task(self.init())
 
     async def init(self):
-        ssl_object = ssl.create_default_context()
-        ssl_object.check_hostname = False
-        ssl_object.verify_mode = ssl.CERT_NONE
         try:
-            self.pool = await asyncpg.create_pool(self.dsn, ssl=ssl_object)
+            with self.bot.startup_timeline.phase("database pool"):
+                self.pool = await asyncpg.create_pool(self.dsn, ssl=self.ssl_object)
+                try:
+                    # Subscribed before the prefixes are loaded, so no change in between is missed
+                    await self.connect_listener()
+                except BaseException:
+                    await self.pool.close()
+                    raise
         except (asyncpg.exceptions.InvalidCatalogNameError,
                 asyncpg.exceptions.InvalidPasswordError,
                 ValueError, TimeoutError, gaierror) as e:
@@ -70,10 +86,7 @@ class Database:
                                colour=discord.Colour.orange())
             print(e.__class__.__name__, str(e))
             self.pool = DudPool()
-            while self.bot.logs is None:
-                print('enter')
-                await asyncio.sleep(1)
-            await self.bot.logs.send(embed=em)
+            self.bot.log_sink.log(embed=em)
             return await self.bot.suicide("Database not connected")
 
         async with self.pool.acquire() as con:
@@ -84,8 +97,63 @@ class Database:
                 await con.execute(submissions_table)
                 print("Created submissions table")
 
+        with self.bot.startup_timeline.phase("load prefixes"):
+            await self.load_prefixes()
+        self.listener_task = self.bot.loop.create_task(self.watch_listener())
+
         self.ready = True
 
+    async def close(self):
+        if self.listener_task is not None:
+            self.listener_task.cancel()
+        if self.listener is not None:
+            await self.listener.close()
+        await self.pool.close()
+
+    async def connect_listener(self):
+        self.listener = await asyncpg.connect(self.dsn, ssl=self.ssl_object)
+        await self.listener.add_listener(PREFIXES_CHANNEL, self._on_prefixes_changed)
+
+    async def watch_listener(self):
+        """Reconnects the connection listening for prefix changes if it drops,
+        then reloads every guild's prefixes in case a change was missed meanwhile"""
+        while not self.bot.is_closed():
+            await asyncio.sleep(LISTENER_CHECK_INTERVAL)
+            try:
+                await self.listener.fetchval("SELECT 1", timeout=10)
+                continue
+            except Exception:
+                print("Prefix listener connection dropped, reconnecting")
+
+            try:
+                if not self.listener.is_closed():
+                    self.listener.terminate()
+                await self.connect_listener()
+                await self.load_prefixes()
+            except Exception:
+                # Tried again at the next check
+                traceback.print_exc()
+
+    async def load_prefixes(self):
+        """Caches every guild's prefixes with a single query"""
+        async with self.pool.acquire() as con:
+            rows = await con.fetch("SELECT server_id, prefixes FROM servers")
+        for row in rows:
+            self.bot.cache_prefixes(row["server_id"], row["prefixes"] or [])
+        self.prefixes_loaded = True
+
+    async def refresh_prefixes(self, guild_id: int):
+        async with self.pool.acquire() as con:
+            prefixes = await con.fetchval("SELECT prefixes FROM servers WHERE server_id = $1", guild_id) or []
+        self.bot.cache_prefixes(guild_id, prefixes)
+
+    def _on_prefixes_changed(self, connection, pid, channel, payload):
+        self.bot.loop.create_task(self.refresh_prefixes(int(payload)))
+
+    @staticmethod
+    async def _notify_prefixes_changed(con, guild_id: int):
+        await con.execute("SELECT pg_notify($1, $2)", PREFIXES_CHANNEL, str(guild_id))
+
     async def generate_id(self):
         """Generate the ID needed to index the submissions"""
         async with self.pool.acquire() as con:
@@ -117,7 +185,9 @@ class Database:
         sql = """UPDATE servers SET prefixes = array_append(prefixes, $1)
                     WHERE server_id = $2"""
         async with self.pool.acquire() as con:
-            await con.execute(sql, prefix, ctx.guild.id)
+            async with con.transaction():
+                await con.execute(sql, prefix, ctx.guild.id)
+                await self._notify_prefixes_changed(con, ctx.guild.id)
         return prefix
 
     # async def enable_default_prefix(self, ctx):
@@ -129,8 +199,10 @@ class Database:
 
     async def remove_prefix(self, ctx, prefix):
         async with self.pool.acquire() as con:
-            await con.execute("UPDATE servers SET prefixes = array_remove(prefixes, $1) WHERE server_id = $2",
-                              prefix, ctx.guild.id)
+            async with con.transaction():
+                await con.execute("UPDATE servers SET prefixes = array_remove(prefixes, $1) WHERE server_id = $2",
+                                  prefix, ctx.guild.id)
+                await self._notify_prefixes_changed(con, ctx.guild.id)
 
     async def add_contest_submission(self, ctx, embed: discord.Embed):
         sub_id = int(await self.generate_id())
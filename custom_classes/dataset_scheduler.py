@@ -0,0 +1,103 @@
+import asyncio
+import traceback
+from datetime import datetime
+from time import monotonic, time
+
+# How soon a data set is retried after its loader fails
+RETRY_INTERVAL = 5 * 60
+
+
+class ScheduledDataset:
+    def __init__(self, name, loader, interval):
+        self.name = name
+        self.loader = loader
+        self.interval = interval
+        self.ready = asyncio.Event()
+        # time() of the next refresh, 0 means straight away
+        self.due = 0
+
+        self.last_refresh = None
+        self.last_duration = None
+        self.last_error = None
+        self.refreshes = 0
+        self.failures = 0
+
+
+class DatasetScheduler:
+    """Refreshes each of the bot's data sets in the background on its own interval.
+    Readers keep getting the current version until the new one is swapped in"""
+
+    def __init__(self, bot, snapshot):
+        self.bot = bot
+        self.snapshot = snapshot
+        self.datasets = {}
+        self.tasks = []
+
+    def register(self, name, loader, interval):
+        self.datasets[name] = ScheduledDataset(name, loader, interval)
+
+    def start(self):
+        """Uses whatever hasn't expired in the snapshot, then starts a refresh task per data set"""
+        with self.bot.startup_timeline.phase("load snapshot"):
+            self.snapshot.load()
+        for name, dataset in self.datasets.items():
+            data = self.snapshot.fresh(name)
+            if data is not None:
+                self.bot.set_dataset(name, data)
+                dataset.ready.set()
+                dataset.due = self.snapshot.datasets[name]["saved"] + dataset.interval
+            self.tasks.append(self.bot.loop.create_task(self.run(dataset)))
+
+    def stop(self):
+        for task in self.tasks:
+            task.cancel()
+
+    async def wait_until_ready(self, name):
+        await self.datasets[name].ready.wait()
+
+    async def run(self, dataset):
+        while not self.bot.is_closed():
+            await asyncio.sleep(max(0, dataset.due - time()))
+            await self.refresh(dataset)
+
+    async def refresh(self, dataset):
+        initial = not dataset.ready.is_set()
+        started_at = time()
+        start = monotonic()
+        try:
+            data = await dataset.loader()
+            # The loaders return nothing rather than raising on timeouts
+            if not data:
+                raise ValueError("loader returned no data")
+        except Exception as e:
+            dataset.failures += 1
+            dataset.last_error = f"{type(e).__name__}: {e}"
+            dataset.due = time() + min(RETRY_INTERVAL, dataset.interval)
+            print(f"Failed to refresh data set {dataset.name}")
+            traceback.print_exc()
+        else:
+            # A single assignment, so readers see either the old or the new version
+            self.bot.set_dataset(dataset.name, data)
+            dataset.refreshes += 1
+            dataset.last_refresh = datetime.utcnow()
+            dataset.due = time() + dataset.interval
+
+            # The data set is already live, failing to save it mustn't stop its refreshes
+            try:
+                self.snapshot.update(dataset.name, data)
+                await self.snapshot.save(self.bot.loop)
+            except Exception:
+                print(f"Failed to save data set {dataset.name} to the snapshot")
+                traceback.print_exc()
+        finally:
+            dataset.last_duration = monotonic() - start
+            dataset.ready.set()
+
+        if initial:
+            self.bot.startup_timeline.record(f"data set {dataset.name}", started_at, dataset.last_duration)
+            if all(d.ready.is_set() for d in self.datasets.values()):
+                try:
+                    await self.bot.save_startup_timeline()
+                except Exception:
+                    print("Failed to save the startup timeline")
+                    traceback.print_exc()
@@ -1,5 +1,10 @@
+import asyncio
+
 import aiohttp
-from bs4 import BeautifulSoup
+
+from .lazy_modules import lazy_import
+
+bs4 = lazy_import("bs4")
 
 
 class CreateDocumentation:
@@ -99,10 +104,22 @@ class CreateDocumentation:
             for ele in el.findAll("div"):
                 self.parse_element(ele, url)
 
-    async def generate_documentation(self):
-        async with aiohttp.ClientSession() as s:
-            async with s.get(self.api) as r:
-                self.parse_soup(BeautifulSoup(await r.text(encoding="utf-8"), "lxml"), r.url)
-            async with s.get(self.commands) as r:
-                self.parse_soup(BeautifulSoup(await r.text(encoding="utf-8"), "lxml"), r.url)
+    @staticmethod
+    async def get_page(session, url):
+        async with session.get(url) as r:
+            return await r.text(encoding="utf-8"), r.url
+
+    def parse_page(self, text, url):
+        self.parse_soup(bs4.BeautifulSoup(text, "lxml"), url)
+
+    async def generate_documentation(self, session=None, loop=None):
+        if session is None:
+            async with aiohttp.ClientSession() as s:
+                return await self.generate_documentation(s, loop)
+
+        loop = loop or asyncio.get_event_loop()
+        pages = await asyncio.gather(self.get_page(session, self.api), self.get_page(session, self.commands))
+        # The pages are large, so they're parsed off the event loop
+        for text, url in pages:
+            await loop.run_in_executor(None, self.parse_page, text, url)
         return self.documentation
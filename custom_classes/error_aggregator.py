@@ -0,0 +1,63 @@
+import traceback
+from collections import OrderedDict
+from datetime import datetime
+from hashlib import sha1
+
+
+class ErrorStats:
+    def __init__(self, fingerprint, error, frame):
+        self.fingerprint = fingerprint
+        self.name = type(error).__qualname__
+        self.frame = frame
+        self.count = 0
+        self.first_seen = datetime.utcnow()
+        self.last_seen = self.first_seen
+        self.last_reported = None
+        # Occurrences since the last sample traceback was logged
+        self.unreported = 0
+        self.commands = set()
+
+
+class ErrorAggregator:
+    """Groups unhandled errors by type and the frame they were raised in,
+    so only one sample traceback of each is logged every `window` seconds"""
+
+    def __init__(self, window=10 * 60, max_fingerprints=500):
+        self.window = window
+        self.max_fingerprints = max_fingerprints
+        self.errors = OrderedDict()
+
+    @staticmethod
+    def fingerprint(error):
+        frames = traceback.extract_tb(error.__traceback__)
+        frame = f"{frames[-1].filename}:{frames[-1].lineno} in {frames[-1].name}" if frames else "unknown"
+        key = f"{type(error).__module__}.{type(error).__qualname__}@{frame}"
+        return sha1(key.encode()).hexdigest()[:8], frame
+
+    def record(self, error, command=None):
+        """Counts an error, returning its stats and whether a sample should be logged"""
+        fingerprint, frame = self.fingerprint(error)
+        stats = self.errors.get(fingerprint)
+        if stats is None:
+            stats = self.errors[fingerprint] = ErrorStats(fingerprint, error, frame)
+            if len(self.errors) > self.max_fingerprints:
+                self.errors.popitem(last=False)
+        self.errors.move_to_end(fingerprint)
+
+        stats.count += 1
+        stats.unreported += 1
+        stats.last_seen = datetime.utcnow()
+        if command is not None:
+            stats.commands.add(str(command))
+
+        report = stats.last_reported is None or \
+            (stats.last_seen - stats.last_reported).total_seconds() >= self.window
+        return stats, report
+
+    @staticmethod
+    def reported(stats):
+        stats.last_reported = stats.last_seen
+        stats.unreported = 0
+
+    def top(self, limit=10):
+        return sorted(self.errors.values(), key=lambda s: s.count, reverse=True)[:limit]
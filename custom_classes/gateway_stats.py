@@ -0,0 +1,78 @@
+from collections import Counter, deque
+from datetime import datetime, timedelta
+from time import monotonic
+
+# Names for gateway payloads that aren't dispatch (op 0) events
+OPCODES = {
+    1: "HEARTBEAT",
+    7: "RECONNECT",
+    9: "INVALID_SESSION",
+    10: "HELLO",
+    11: "HEARTBEAT_ACK",
+}
+
+
+class GatewayStats:
+    """Gateway traffic statistics, updated synchronously from KernBot.dispatch
+    so that no task is scheduled per frame"""
+
+    def __init__(self, window=60):
+        self.window = window
+        self.last_receive = None
+        self.frames = 0
+        self.bytes = 0
+        self.events = Counter()
+        self.disconnected_at = None
+
+        # (second, frames, bytes) for each of the last `window` seconds
+        self._buckets = deque(maxlen=window)
+
+    def on_frame(self, data):
+        now = self.last_receive = monotonic()
+        size = len(data)
+        self.frames += 1
+        self.bytes += size
+
+        second = int(now)
+        if self._buckets and self._buckets[-1][0] == second:
+            _, frames, size_ = self._buckets[-1]
+            self._buckets[-1] = (second, frames + 1, size_ + size)
+        else:
+            self._buckets.append((second, 1, size))
+
+    def on_payload(self, payload):
+        self.events[payload.get("t") or OPCODES.get(payload.get("op"), "UNKNOWN")] += 1
+
+    def on_disconnect(self):
+        if self.disconnected_at is None:
+            self.disconnected_at = self.last_receive or monotonic()
+
+    def on_ready(self):
+        # A new session was identified rather than resumed, so the outage is never reported
+        self.disconnected_at = None
+
+    def pop_downtime(self):
+        """Returns when the gateway last went quiet and for how many seconds, or None"""
+        if self.disconnected_at is None:
+            return None
+        downtime = monotonic() - self.disconnected_at
+        self.disconnected_at = None
+        return datetime.utcnow() - timedelta(seconds=downtime), downtime
+
+    def _recent(self):
+        oldest = int(monotonic()) - self.window
+        return [bucket for bucket in self._buckets if bucket[0] > oldest]
+
+    @property
+    def frames_per_second(self):
+        return sum(frames for _, frames, _ in self._recent()) / self.window
+
+    @property
+    def bytes_per_second(self):
+        return sum(size for _, _, size in self._recent()) / self.window
+
+    @property
+    def seconds_since_receive(self):
+        if self.last_receive is None:
+            return None
+        return monotonic() - self.last_receive
@@ -0,0 +1,111 @@
+import asyncio
+from collections import OrderedDict, defaultdict
+
+import custom_classes as cc
+
+
+class HelpEntry:
+    """A command's help fields, formatted once rather than on every `help`"""
+
+    def __init__(self, command):
+        self.command = command
+        self.cog_name = command.cog_name or "No Category"
+        self.short_field = {
+            "name": command.qualified_name,
+            "value": command.short_doc or "No description.",
+            "inline": False,
+        }
+        self.long_field = {
+            "name": command.qualified_name,
+            "value": f"{command.help or ''}\n```{command.signature}```",
+            "inline": False,
+        }
+
+
+class HelpIndex:
+    """Every visible command's help, with the commands each permission profile can run cached.
+    A profile is the guild, the author's roles and channel permissions and whether they're an owner.
+    Rebuilt whenever a command is added or removed, and a guild's profiles are dropped when its roles change"""
+
+    def __init__(self, max_profiles=1024):
+        self.max_profiles = max_profiles
+        self._entries = None
+        self.runnable = OrderedDict()
+        self.pages = {}
+        # Bumped by invalidate, so results worked out across an invalidation aren't cached
+        self.generation = 0
+
+    @property
+    def entries(self):
+        return self._entries or []
+
+    def build(self, bot):
+        commands = {command for command in bot.walk_commands() if not command.hidden}
+        self._entries = sorted((HelpEntry(command) for command in commands),
+                               key=lambda e: (e.cog_name, e.command.qualified_name))
+
+    def invalidate(self, guild_id=None):
+        self.generation += 1
+        if guild_id is None:
+            self._entries = None
+            self.runnable.clear()
+            self.pages.clear()
+            return
+
+        for profile in [p for p in self.runnable if p[0] == guild_id]:
+            del self.runnable[profile]
+        for key in [k for k in self.pages if k[0][0] == guild_id]:
+            del self.pages[key]
+
+    @staticmethod
+    async def profile(ctx):
+        owner = await ctx.bot.is_owner(ctx.author)
+        if ctx.guild is None:
+            return None, frozenset(), 0, owner
+        return (ctx.guild.id,
+                frozenset(role.id for role in ctx.author.roles),
+                ctx.channel.permissions_for(ctx.author).value,
+                owner)
+
+    async def runnable_entries(self, ctx):
+        profile = await self.profile(ctx)
+        entries = self.runnable.get(profile)
+        if entries is not None:
+            self.runnable.move_to_end(profile)
+            return profile, entries
+
+        if self._entries is None:
+            self.build(ctx.bot)
+        # Bound before the checks run, since a cog reload can invalidate the index meanwhile
+        all_entries = self._entries
+        generation = self.generation
+        can_run = await asyncio.gather(*(cc.safe_can_run(e.command, ctx) for e in all_entries))
+        entries = [e for e, runs in zip(all_entries, can_run) if runs]
+        if generation == self.generation:
+            self.runnable[profile] = entries
+            if len(self.runnable) > self.max_profiles:
+                oldest = next(iter(self.runnable))
+                del self.runnable[oldest]
+                self.pages = {k: v for k, v in self.pages.items() if k[0] != oldest}
+        return profile, entries
+
+    async def get_pages(self, ctx, long_doc=False, max_fields=5, check=None):
+        """The fields for each page of help as (cog name, page of that cog, fields),
+        cached per profile unless filtered with `check`"""
+        generation = self.generation
+        profile, entries = await self.runnable_entries(ctx)
+        key = (profile, long_doc, max_fields)
+        if check is None and key in self.pages:
+            return self.pages[key]
+
+        cogs = defaultdict(list)
+        for entry in entries:
+            if check is None or check(entry.command):
+                cogs[entry.cog_name].append(entry.long_field if long_doc else entry.short_field)
+
+        pages = [(cog, index, chunk)
+                 for cog, fields in cogs.items()
+                 for index, chunk in enumerate(cc.chunks(fields, max_fields))]
+        if check is None and generation == self.generation:
+            self.pages[key] = pages
+        return pages
@@ -0,0 +1,163 @@
+import asyncio
+import json
+from collections import defaultdict, deque
+from time import monotonic
+from urllib.parse import urlparse
+
+import aiohttp
+
+from .circuit_breaker import CircuitBreaker
+from .response_cache import ResponseCache
+
+# Hedging needs this many latency samples for a host before it can pick a delay
+MIN_HEDGE_SAMPLES = 20
+
+
+class FetchedResponse:
+    """A fully read response, so one can be shared by every caller of a coalesced request"""
+
+    def __init__(self, status, reason, url, headers, body):
+        self.status = status
+        self.reason = reason
+        self.url = url
+        self.headers = headers
+        self.body = body
+
+    def text(self, encoding="utf-8"):
+        return self.body.decode(encoding)
+
+    def json(self):
+        return json.loads(self.text())
+
+
+class HTTPClient:
+    """The bot's shared aiohttp session, with per-host connection limits, a DNS cache and keep-alive.
+    Identical GETs that are in flight at the same time are only sent once.
+
+    Each host has a circuit breaker, so requests to a host that keeps failing fail straight away
+    with UpstreamUnavailable. Hedged GETs send a second request if the first one is slower
+    than `hedge_percentile` of that host's recent requests, and use whichever finishes first"""
+
+    def __init__(self, trace_configs=(), limit=100, limit_per_host=10, timeout=8, hedge_percentile=0.95):
+        connector = aiohttp.TCPConnector(limit=limit,
+                                         limit_per_host=limit_per_host,
+                                         ttl_dns_cache=300,
+                                         keepalive_timeout=60)
+        self.session = aiohttp.ClientSession(connector=connector,
+                                             trace_configs=list(trace_configs))
+        # Shorter than the 10 second timeouts the commands wrap requests in, so a hanging host
+        # fails here with a TimeoutError the breaker counts, rather than the caller cancelling it
+        self.timeout = timeout
+        self.in_flight = {}
+        self.coalesced = 0
+        self.cache = ResponseCache()
+
+        self.breakers = {}
+        self.latencies = defaultdict(lambda: deque(maxlen=100))
+        self.hedge_percentile = hedge_percentile
+        self.hedged = 0
+
+    async def get(self, url, *, headers=None, params=None, coalesce=True, cache=False, hedge=False, timeout=None):
+        """GETs and reads `url`. Pass coalesce=False for endpoints that answer each request differently,
+        cache=True to answer from (and store in) the response cache, hedge=True to hedge slow requests
+        and timeout for a download that needs longer than the client's default"""
+        if not coalesce:
+            return await self.request("GET", url, hedge=hedge, timeout=timeout, headers=headers, params=params)
+
+        key = (url,
+               tuple(sorted((headers or {}).items())),
+               tuple(sorted((params or {}).items())))
+
+        if cache:
+            response = self.cache.get(key)
+            if response is None:
+                response = await self._get_coalesced(key, url, headers, params, hedge, timeout)
+                self.cache.put(key, url, response)
+            return response
+
+        return await self._get_coalesced(key, url, headers, params, hedge, timeout)
+
+    async def _get_coalesced(self, key, url, headers, params, hedge, timeout):
+        task = self.in_flight.get(key)
+        if task is None:
+            coro = self.request("GET", url, hedge=hedge, timeout=timeout, headers=headers, params=params)
+            task = self.in_flight[key] = asyncio.ensure_future(coro)
+            task.add_done_callback(lambda _: self.in_flight.pop(key, None))
+            # Retrieved here in case every caller timed out before it finished
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        else:
+            self.coalesced += 1
+
+        # Shielded so one caller timing out doesn't cancel the request for the others
+        return await asyncio.shield(task)
+
+    async def get_json(self, url, **kwargs):
+        return (await self.get(url, **kwargs)).json()
+
+    async def post(self, url, **kwargs):
+        return await self.request("POST", url, **kwargs)
+
+    def breaker(self, host):
+        if host not in self.breakers:
+            self.breakers[host] = CircuitBreaker(host)
+        return self.breakers[host]
+
+    async def request(self, method, url, *, hedge=False, timeout=None, **kwargs):
+        host = urlparse(url).hostname
+        breaker = self.breaker(host)
+        breaker.before_request()
+
+        start = monotonic()
+        try:
+            if hedge:
+                coro = self._hedged(host, method, url, **kwargs)
+            else:
+                coro = self._send(method, url, **kwargs)
+            # One deadline for the whole request, including any hedge
+            response = await asyncio.wait_for(coro, timeout or self.timeout)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            breaker.record_failure()
+            raise
+        except asyncio.CancelledError:
+            breaker.release_trial()
+            raise
+
+        if response.status >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+            self.latencies[host].append(monotonic() - start)
+        return response
+
+    async def _send(self, method, url, **kwargs):
+        async with self.session.request(method, url, **kwargs) as resp:
+            return FetchedResponse(resp.status, resp.reason, resp.url, resp.headers, await resp.read())
+
+    def hedge_delay(self, host):
+        samples = sorted(self.latencies[host])
+        if len(samples) < MIN_HEDGE_SAMPLES:
+            return None
+        return samples[int(self.hedge_percentile * (len(samples) - 1))]
+
+    async def _hedged(self, host, method, url, **kwargs):
+        first = asyncio.ensure_future(self._send(method, url, **kwargs))
+        pending = {first}
+        try:
+            delay = self.hedge_delay(host)
+            if delay is not None:
+                done, _ = await asyncio.wait(pending, timeout=delay)
+                if not done:
+                    self.hedged += 1
+                    pending.add(asyncio.ensure_future(self._send(method, url, **kwargs)))
+
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None or not pending:
+                        return task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def close(self):
+        await self.session.close()
@@ -1,23 +1,28 @@
+from collections import Counter
 from concurrent.futures import FIRST_COMPLETED
 from datetime import datetime
 from os import listdir
 from signal import SIGTERM
+from time import time
 
 import aioftp
 import aiohttp
-import async_timeout
 import discord
+from aiohttp import web
 
 import custom_classes as cc
 from .data_classes import *
 from .documentation import CreateDocumentation
 
+COIN_LIST_URL = "https://min-api.cryptocompare.com/data/all/coinlist"
+STARTUP_TIMELINE_PATH = "startup.json"
+
 
 class KernBot(commands.Bot):
     database = None
     latest_commit = None
-    latest_message_time = None
     owner = None
+    http_client = None
     session = None
 
     demotivators = {}
@@ -30,17 +35,51 @@ class KernBot(commands.Bot):
 
     crypto = {"market_price": {}, "coins": []}
 
-    def __init__(self, github_auth, log_channel, testing=False, debug=False,
-                 *args, **kwargs):
+    def __init__(self, github_auth, log_channel, default_prefixes=(), testing=False,
+                 debug=False, chain_concurrency=1, cluster_id=None, cluster_port=None,
+                 web_port=None, web_host="0.0.0.0", snapshot_path="snapshot.json", dbl_token=None, dbots_interval=300,
+                 paste_backend="gist", public_url=None, *args, **kwargs):
+        # Everything from the process starting until now was importing modules
+        self.startup_timeline = cc.StartupTimeline()
+        self.startup_timeline.record("import", self.startup_timeline.started, time() - self.startup_timeline.started)
+
         self.github_auth = aiohttp.BasicAuth(github_auth[0], github_auth[1])
+        self.default_prefixes = list(default_prefixes)
+        # How many segments of a `&&` chain may run at once, 1 keeps them sequential
+        self.chain_concurrency = chain_concurrency
         self.testing = testing
 
         self.launch_time = datetime.utcnow()
-        self.ftp_client = aioftp.Client()
+        self.prefilter_stats = Counter()
+        self.error_aggregator = cc.ErrorAggregator()
+        self.help_index = cc.HelpIndex()
+        self.gateway_stats = cc.GatewayStats()
+        self.metrics = cc.Metrics(self)
+        self.snapshot = cc.Snapshot(snapshot_path)
+        self.dataset_scheduler = cc.DatasetScheduler(self, self.snapshot)
+        self.register_datasets()
+
+        # Serves /metrics when a port is given
+        self.web_port = web_port
+        self.web_host = web_host
+        self.web_app = web.Application()
+        self.web_app.router.add_get("/metrics", self.metrics.handle_metrics)
+        self.web_runner = None
+        self.paste_store = cc.create_paste_store(self, paste_backend, public_url)
 
         super().__init__(*args, **kwargs)
 
-        self.logs = self.get_channel(log_channel)
+        self.waiters = cc.WaiterRegistry(self.loop)
+        self.reaction_placer = cc.ReactionPlacer(self.loop)
+        self.outbound = cc.OutboundQueue(self.loop)
+
+        # Only set when running as one worker of launcher.py
+        self.cluster = None
+        if cluster_id is not None:
+            self.cluster = cc.ClusterClient(self, cluster_id, cluster_port)
+        self.server_count_publisher = cc.ServerCountPublisher(self, dbl_token, dbots_interval)
+
+        self.log_sink = cc.LogSink(self, log_channel)
         self.database = cc.Database(self)
 
         extensions = sorted(
@@ -55,70 +94,242 @@ class KernBot(commands.Bot):
         self.loop.set_debug(debug)
 
         self.load_extensions(extensions)
+        self.register_gauges()
 
     async def init(self):
-        self.session = aiohttp.ClientSession()
-        await self.ftp_client.connect("ftp.bom.gov.au", 21)
-        await self.ftp_client.login()
+        self.http_client = cc.HTTPClient(trace_configs=[self.metrics.trace_config()])
+        # Still used directly for POSTs and the data set loaders
+        self.session = self.http_client.session
+        # The gateway connects straight away, commands wait for the data sets they need
+        self.dataset_scheduler.start()
 
-        self.demotivators = await cc.get_demotivators(self.session)
-        self.trivia_categories = await cc.get_trivia_categories(self.session)
+    def register_datasets(self):
+        """Each data set is refreshed in the background once its snapshot TTL is up"""
+        loaders = {
+            "demotivators": lambda: cc.get_demotivators(self.session, self.loop),
+            "trivia_categories": lambda: cc.get_trivia_categories(self.session),
+            "coins": self.get_coins,
+            "forecast": self.get_forecasts,
+            "documentation": lambda: CreateDocumentation().generate_documentation(self.session, self.loop),
+        }
+        for name, loader in loaders.items():
+            self.dataset_scheduler.register(name, loader, cc.DATASET_TTLS[name])
 
-        try:
-            with async_timeout.timeout(30):
-                async with self.session.get("https://min-api.cryptocompare.com/data/all/coinlist") as resp:
-                    self.crypto['coins'] = {k.upper(): v for k, v in (await resp.json())['Data'].items()}
-        except asyncio.TimeoutError:
-            pass
+    def set_dataset(self, name, value):
+        if name == "coins":
+            self.crypto["coins"] = value
+        else:
+            setattr(self, name, value)
+
+    async def wait_for_dataset(self, name):
+        await self.dataset_scheduler.wait_until_ready(name)
 
-        self.forecast = await cc.get_forecasts(self.ftp_client)
-        # self.weather = await cc.get_weather(self.ftp_client)
-        self.documentation = await CreateDocumentation().generate_documentation()
+    async def get_coins(self):
+        # The coin list is several megabytes, so it gets longer than the client's default
+        js = await self.http_client.get_json(COIN_LIST_URL, hedge=True, timeout=30)
+        return {k.upper(): v for k, v in js['Data'].items()}
+
+    @staticmethod
+    async def get_forecasts():
+        # A new connection each refresh, the server drops idle ones long before the next
+        ftp_client = aioftp.Client()
+        await ftp_client.connect("ftp.bom.gov.au", 21)
+        await ftp_client.login()
+        try:
+            return await cc.get_forecasts(ftp_client)
+        finally:
+            ftp_client.close()
 
     def load_extensions(self, extensions):
-        for extension in extensions:
-            try:
-                self.load_extension(extension)
-            except (discord.ClientException, ModuleNotFoundError, SyntaxError):
-                print(f'Failed to load extension {extension}.')
-                traceback.print_exc()
-                quit()
+        with self.startup_timeline.phase("load_extensions"):
+            for extension in extensions:
+                cogs_before = set(self.cogs)
+                try:
+                    with self.startup_timeline.phase(f"load {extension}"):
+                        self.load_extension(extension)
+                except (discord.ClientException, ModuleNotFoundError, SyntaxError):
+                    print(f'Failed to load extension {extension}.')
+                    traceback.print_exc()
+                    quit()
+
+                for name in set(self.cogs) - cogs_before:
+                    # Timed by KernCog.__new__, which runs before the cog is added
+                    analysis_time = getattr(self.cogs[name], "error_analysis_time", 0)
+                    self.startup_timeline.record(f"error analysis {name}", time() - analysis_time, analysis_time)
+
+    async def save_startup_timeline(self):
+        await self.startup_timeline.save(STARTUP_TIMELINE_PATH, self.loop)
 
     async def close(self, message="Shutting Down"):
         print(f"\n{message}\n")
         em = discord.Embed(title=f"{message} @ {datetime.utcnow().strftime('%H:%M:%S')}", colour=discord.Colour.red())
         em.timestamp = datetime.utcnow()
-        await self.logs.send(embed=em)
-        await self.database.pool.close()
-        await self.session.close()
+        self.log_sink.log(embed=em)
+        await self.log_sink.close()
+        self.dataset_scheduler.stop()
+        self.server_count_publisher.stop()
+        self.reaction_placer.cancel_all()
+        self.outbound.cancel_all()
+        await self.database.close()
+        await self.http_client.close()
+        if self.cluster is not None:
+            self.cluster.close()
+        if self.web_runner is not None:
+            await self.web_runner.cleanup()
         await super().close()
 
+    def dispatch(self, event_name, *args, **kwargs):
+        # Tracked here rather than with listeners, which would create a task for every frame
+        if event_name == "socket_raw_receive":
+            self.gateway_stats.on_frame(args[0])
+        elif event_name == "socket_response":
+            self.gateway_stats.on_payload(args[0])
+        elif event_name == "disconnect":
+            self.gateway_stats.on_disconnect()
+        elif event_name in ("ready", "shard_ready"):
+            self.gateway_stats.on_ready()
+        elif event_name in ("guild_role_update", "guild_role_delete"):
+            self.help_index.invalidate(args[0].guild.id)
+        elif event_name == "guild_update":
+            self.help_index.invalidate(args[1].id)
+        self.waiters.dispatch(event_name, *args)
+        super().dispatch(event_name, *args, **kwargs)
+
     async def start(self, *args, **kwargs):
+        if self.cluster is not None:
+            await self.cluster.connect()
+        if self.web_port is not None:
+            await self.start_web_server()
+        self.loop.create_task(self.metrics.measure_loop_lag())
+        self.server_count_publisher.start()
+        self.log_sink.start()
         await self.init()
         await super().start(*args, **kwargs)
 
-    async def wait_for_any(self, events, checks, timeout=None):
-        if not isinstance(checks, list):
-            checks = [checks]
-        if len(checks) == 1:
-            checks *= len(events)
-        mapped = zip(events, checks)
-        to_wait = [self.wait_for(event, check=check) for event, check in mapped]
-        done, _ = await asyncio.wait(to_wait, timeout=timeout, return_when=FIRST_COMPLETED)
+    async def start_web_server(self):
+        self.web_runner = web.AppRunner(self.web_app)
+        await self.web_runner.setup()
+        await web.TCPSite(self.web_runner, self.web_host, self.web_port).start()
+
+    def add_command(self, command):
+        super().add_command(command)
+        self.help_index.invalidate()
+
+    def remove_command(self, name):
+        command = super().remove_command(name)
+        self.help_index.invalidate()
+        return command
+
+    async def invoke(self, ctx):
+        start = self.loop.time()
+        await super().invoke(ctx)
+        if ctx.command is not None:
+            name = ctx.command.qualified_name
+            self.metrics.inc("kern_command_invocations_total", command=name)
+            self.metrics.observe("kern_command_duration_seconds", self.loop.time() - start, command=name)
+
+    def register_gauges(self):
+        gateway = self.gateway_stats
+        self.metrics.gauge("kern_event_loop_lag_seconds", lambda: self.metrics.loop_lag)
+        self.metrics.gauge("kern_guilds", lambda: len(self.guilds))
+        self.metrics.gauge("kern_gateway_frames_per_second", lambda: gateway.frames_per_second)
+        self.metrics.gauge("kern_gateway_bytes_per_second", lambda: gateway.bytes_per_second)
+        self.metrics.gauge("kern_gateway_seconds_since_receive", lambda: gateway.seconds_since_receive)
+        self.metrics.gauge("kern_gateway_events", lambda: {(("event", k),): v for k, v in gateway.events.items()})
+        self.metrics.gauge("kern_prefilter_messages",
+                           lambda: {(("result", k),): v for k, v in self.prefilter_stats.items()})
+        self.metrics.gauge("kern_db_pool_connections", self.pool_usage)
+        self.metrics.gauge("kern_pending_waiters", lambda: len(self.waiters))
+        self.metrics.gauge("kern_error_fingerprints", lambda: len(self.error_aggregator.errors))
+        self.metrics.gauge("kern_outbound_queue_depth", lambda: self.outbound.depth)
+        self.metrics.gauge("kern_outbound_queue_max_channel_depth", lambda: self.outbound.max_channel_depth)
+        self.metrics.gauge("kern_outbound_queue_channels", lambda: len(self.outbound.channels))
+        self.metrics.gauge("kern_dbots_publishes", lambda: self.server_count_publisher.publishes)
+        self.metrics.gauge("kern_reaction_placements", lambda: len(self.reaction_placer))
+        self.metrics.gauge("kern_reactions_placed", lambda: self.reaction_placer.placed)
+        self.metrics.gauge("kern_http_coalesced_requests",
+                           lambda: self.http_client.coalesced if self.http_client else 0)
+        self.metrics.gauge("kern_http_cache_events",
+                           lambda: {(("event", k),): v for k, v in self.http_client.cache.stats.items()}
+                           if self.http_client else {})
+        self.metrics.gauge("kern_http_open_circuits",
+                           lambda: sum(b.state != "closed" for b in self.http_client.breakers.values())
+                           if self.http_client else 0)
+        self.metrics.gauge("kern_http_hedged_requests",
+                           lambda: self.http_client.hedged if self.http_client else 0)
+
+        datasets = self.dataset_scheduler.datasets.values()
+        self.metrics.gauge("kern_dataset_refresh_duration_seconds",
+                           lambda: {(("dataset", d.name),): d.last_duration
+                                    for d in datasets if d.last_duration is not None})
+        self.metrics.gauge("kern_dataset_refresh_failures",
+                           lambda: {(("dataset", d.name),): d.failures for d in datasets})
+
+    def pool_usage(self):
+        # asyncpg's pool doesn't expose its size publicly
+        # noinspection PyProtectedMember
+        holders = getattr(self.database.pool, "_holders", [])
+        queue = getattr(self.database.pool, "_queue", None)
+        return {
+            (("state", "total"),): len(holders),
+            (("state", "idle"),): queue.qsize() if queue is not None else 0,
+        }
+
+    async def wait_for_any(self, waits, timeout=None):
+        """Waits for the first of `waits`, (event, key, check) tuples for the waiter registry"""
+        futures = [self.waiters.wait(event, key, check) for event, key, check in waits]
+        try:
+            done, _ = await asyncio.wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
+        finally:
+            for (event, key, _), future in zip(waits, futures):
+                future.cancel()
+                self.waiters.discard(event, key, future)
+        if not done:
+            raise asyncio.TimeoutError()
         return done.pop().result()
 
+    def cache_prefixes(self, guild_id, guild_prefixes=()):
+        """Compiles and caches the prefix matcher for a guild (None for DMs)"""
+        matcher = cc.PrefixMatcher(self.default_prefixes, guild_prefixes)
+        self.prefixes_cache[guild_id] = matcher
+        return matcher
+
+    @property
+    def guild_count(self):
+        """Guilds across every cluster, or just this process when not clustered"""
+        if self.cluster is not None and self.cluster.totals:
+            return self.cluster.totals["guilds"]
+        return len(self.guilds)
+
+    @property
+    def member_count(self):
+        if self.cluster is not None and self.cluster.totals:
+            return self.cluster.totals["members"]
+        return sum(1 for _ in self.get_all_members())
+
+    async def publish_cluster_stats(self):
+        if self.cluster is None:
+            return
+        try:
+            await self.cluster.publish_stats()
+        except ConnectionError:
+            # The cluster client reconnects on its own and publishes again once it has
+            print(f"Cluster {self.cluster.cluster_id} couldn't send its stats to the supervisor")
+
+    def could_be_command(self, message, content=None):
+        """Cheaply rejects content that can't start with a prefix, before a context is built"""
+        matcher = self.prefixes_cache.get(message.guild.id if message.guild else None)
+        if matcher is None:
+            # Not compiled yet, so get_prefix has to look it up
+            return True
+        return matcher.match(message.content if content is None else content, self.user.id) is not None
+
     def get_emojis(self, *ids):
         emojis = []
         for e_id in ids:
             emojis.append(str(self.get_emoji(e_id)))
         return emojis
 
-    async def update_dbots_server_count(self, dbl_token):
-        url = f"https://discordbots.org/api/bots/{self.user.id}/stats"
-        headers = {"Authorization": dbl_token}
-        payload = {"server_count": len(self.guilds)}
-        try:
-            with async_timeout.timeout(10):
-                await self.session.post(url, data=payload, headers=headers)
-        except asyncio.TimeoutError:
-            pass
+
+class ShardedKernBot(KernBot, commands.AutoShardedBot):
+    """KernBot for a launcher.py worker, which runs the shards it's given in one process"""
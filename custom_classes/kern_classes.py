@@ -1,4 +1,5 @@
 from datetime import datetime
+from time import perf_counter
 
 import discord
 from discord.ext import commands
@@ -9,6 +10,7 @@ from custom_classes import Ast
 class KernCog(commands.Cog, metaclass=commands.CogMeta):
     def __new__(cls, *args, **kwargs):
         self = super().__new__(cls, *args, **kwargs)
+        start = perf_counter()
         for command in self.walk_commands():
             if hasattr(command, "on_error"):
                 command.handled_errors = Ast(command.on_error).errors
@@ -17,10 +19,11 @@ class KernCog(commands.Cog, metaclass=commands.CogMeta):
 
         cog_error_handler = self._get_overridden_method(self.cog_command_error)
         if cog_error_handler:
-            self.handled_errors = Ast(cog_error_handler)
+            self.handled_errors = Ast(cog_error_handler).errors
         else:
             self.handled_errors = []
 
+        self.error_analysis_time = perf_counter() - start
         return self
 
 
@@ -44,6 +47,12 @@ class KernContext(commands.Context):
             pass
 
     async def __embed(self, title, description, colour, rqst_by, timestamp, channel, footer, **kwargs):
+        e = self.__build_embed(title, description, colour, rqst_by, timestamp, footer)
+        if channel is None:
+            return await self.send(embed=e, **kwargs)
+        return await self.bot.outbound.send(channel.id, channel.send, embed=e, **kwargs)
+
+    def __build_embed(self, title, description, colour, rqst_by, timestamp, footer):
         e = discord.Embed(colour=colour)
         if title is not None:
             e.title = str(title)
@@ -57,9 +66,7 @@ class KernContext(commands.Context):
             timestamp = datetime.utcnow()
         if isinstance(timestamp, datetime):
             e.timestamp = timestamp
-        if channel is None:
-            return await self.send(embed=e, **kwargs)
-        return await channel.send(embed=e, **kwargs)
+        return e
 
     async def error(self, error, title="Error:", channel: discord.TextChannel = None, footer=None, **kwargs):
         if isinstance(error, Exception):
@@ -74,18 +81,35 @@ class KernContext(commands.Context):
     async def neutral(self, text, title=None, channel: discord.TextChannel = None, rqst_by=True, timestamp=None, footer=None, **kwargs):
         return await self.__embed(title, text, 0x36393E, rqst_by, timestamp, channel, footer, **kwargs)
 
+    def neutral_embed(self, text, title=None, rqst_by=True, timestamp=None, footer=None):
+        """The embed `neutral` sends, for pages a Paginator sends instead"""
+        return self.__build_embed(title, text, 0x36393E, rqst_by, timestamp, footer)
+
     async def warning(self, warning, title=None, channel: discord.TextChannel = None, rqst_by=True, timestamp=None, footer=None, **kwargs):
         return await self.__embed(title, warning, discord.Colour.orange(), rqst_by, timestamp, channel, footer, **kwargs)
 
     async def upload(self, content):
-        json = {"files": {"output.md": {"content": content}}}
-        async with self.bot.session.post("https://api.github.com/gists", json=json, auth=self.bot.github_auth) as r:
-            link = (await r.json())["html_url"]
-        return link
+        """Puts `content` in the paste store, returning a Paste with either a link or a file to attach"""
+        return await self.bot.paste_store.paste(content)
 
     async def send(self, content: str = None, *, tts=False, embed=None, file=None, files=None, delete_after=None, nonce=None):
         content = str(content) if content is not None else None
         if content and len(content) > 1990:
-            content = "**Output too long**: " + await self.upload(content)
-
-        return await super().send(content=content, tts=tts, embed=embed, file=file, files=files, delete_after=delete_after, nonce=nonce)
+            paste = await self.upload(content)
+            if paste.link is not None:
+                content = "**Output too long**: " + paste.link
+            else:
+                content = "**Output too long**, it's attached instead"
+                files = [f for f in [file] if f is not None] + list(files or []) + [paste.file]
+                file = None
+
+        # Queued per channel, so a busy channel waits here rather than on a 429 inside discord.py
+        message = await self.bot.outbound.send(self.channel.id, super().send, content=content, tts=tts, embed=embed,
+                                               file=file, files=files, delete_after=delete_after, nonce=nonce)
+        if message.attachments:
+            self.bot.paste_store.sent(message)
+        return message
+
+    async def edit(self, message, **fields):
+        """Edits one of our messages, merged with any other edits to it that haven't been sent yet"""
+        return await self.bot.outbound.edit(message, **fields)
@@ -0,0 +1,50 @@
+import importlib
+import threading
+from time import perf_counter
+
+# Seconds each lazy module took to import, for the owner imports command
+IMPORT_TIMES = {}
+
+_lazy_modules = {}
+_lock = threading.Lock()
+
+
+class LazyModule:
+    """Stands in for a module, importing it the first time one of its attributes is used"""
+
+    def __init__(self, name, setup=None):
+        self._name = name
+        self._setup = setup
+        self._module = None
+
+    def _load(self):
+        # Also called from an executor thread when warming up, see load_lazy_modules
+        with _lock:
+            if self._module is None:
+                start = perf_counter()
+                if self._setup is not None:
+                    self._setup()
+                self._module = importlib.import_module(self._name)
+                IMPORT_TIMES[self._name] = perf_counter() - start
+        return self._module
+
+    def __getattr__(self, item):
+        return getattr(self._load(), item)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<LazyModule {self._name} ({state})>"
+
+
+def lazy_import(name, setup=None):
+    """Returns a LazyModule for `name`, shared between everything that imports it.
+    `setup` runs just before the import, e.g. to pick a matplotlib backend"""
+    if name not in _lazy_modules:
+        _lazy_modules[name] = LazyModule(name, setup)
+    return _lazy_modules[name]
+
+
+def load_lazy_modules():
+    """Imports every lazy module that hasn't been used yet"""
+    for module in list(_lazy_modules.values()):
+        module._load()
@@ -0,0 +1,130 @@
+import asyncio
+import io
+import traceback
+from collections import Counter
+from datetime import datetime
+
+import discord
+
+# Leaves room for the timestamps added to each entry
+DESCRIPTION_LIMIT = 2000
+FIELD_LIMIT = 1024
+# How many flushes an entry is part of before it's given up on
+MAX_ATTEMPTS = 3
+# Longest wait between flushes while sends keep failing
+MAX_BACKOFF = 300
+
+
+class LogEntry:
+    def __init__(self, content=None, embed=None, title=None):
+        self.time = datetime.utcnow()
+        self.attempts = 0
+        self.embed = embed
+        self.body = (embed.description if embed is not None and embed.description else content) or ""
+        self.title = title or (embed.title if embed is not None else None) or self.body.strip().split("\n")[0][:100]
+
+    def render(self):
+        if self.body == self.title:
+            return f"`{self.time.strftime('%H:%M:%S')}` {self.body}"
+        return f"`{self.time.strftime('%H:%M:%S')}` **{self.title}**\n{self.body}"
+
+
+class LogSink:
+    """Buffers entries for the log channel and sends them every `interval` seconds as one message.
+    Entries too long for an embed are attached as a file under a summary, and once `max_entries`
+    are waiting new ones are only counted, so a burst can't run into the channel's rate limit"""
+
+    def __init__(self, bot, channel_id, interval=5, max_entries=200):
+        self.bot = bot
+        self.channel_id = channel_id
+        self.interval = interval
+        self.max_entries = max_entries
+        self.entries = []
+        self.dropped = Counter()
+        self.task = None
+
+    def log(self, content=None, *, embed=None, title=None):
+        """Queues an entry, `title` is what it's counted as in summaries"""
+        entry = LogEntry(content, embed, title)
+        if len(self.entries) >= self.max_entries:
+            self.dropped[entry.title] += 1
+        else:
+            self.entries.append(entry)
+
+    def start(self):
+        self.task = self.bot.loop.create_task(self.run())
+
+    async def run(self):
+        failures = 0
+        while not self.bot.is_closed():
+            await asyncio.sleep(min(self.interval * 2 ** failures, MAX_BACKOFF))
+            try:
+                sent = await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                traceback.print_exc()
+                sent = False
+            failures = 0 if sent else min(failures + 1, 10)
+
+    async def close(self):
+        if self.task is not None:
+            self.task.cancel()
+        await self.flush()
+
+    async def flush(self):
+        """Sends the waiting entries, returning False if they were put back after a failed send"""
+        # Kept until the channel is in the cache, which it isn't before the gateway is ready
+        channel = self.bot.get_channel(self.channel_id)
+        if channel is None or not (self.entries or self.dropped):
+            return True
+
+        entries, self.entries = self.entries, []
+        dropped, self.dropped = self.dropped, Counter()
+        try:
+            await channel.send(**self.render(entries, dropped))
+        except asyncio.CancelledError:
+            self.requeue(entries, dropped)
+            raise
+        except Exception:
+            traceback.print_exc()
+            self.requeue(entries, dropped)
+            return False
+        return True
+
+    def requeue(self, entries, dropped):
+        """Puts a batch that failed to send back in front of the newer entries, up to MAX_ATTEMPTS times"""
+        retry = []
+        for entry in entries:
+            entry.attempts += 1
+            if entry.attempts < MAX_ATTEMPTS:
+                retry.append(entry)
+            else:
+                dropped[entry.title] += 1
+
+        self.entries = retry + self.entries
+        for entry in self.entries[self.max_entries:]:
+            dropped[entry.title] += 1
+        del self.entries[self.max_entries:]
+        self.dropped.update(dropped)
+
+    @staticmethod
+    def summarise(counts, limit):
+        summary = "\n".join(f"{count}x {title}" for title, count in counts.most_common(20))
+        return summary if len(summary) <= limit else summary[:limit - 3] + "..."
+
+    def render(self, entries, dropped):
+        if len(entries) == 1 and not dropped and entries[0].embed is not None:
+            return {"embed": entries[0].embed}
+
+        embed = discord.Embed(title=f"{len(entries)} log entries", colour=0x36393E, timestamp=datetime.utcnow())
+        if dropped:
+            embed.add_field(name=f"{sum(dropped.values())} more not logged", value=self.summarise(dropped, FIELD_LIMIT))
+
+        text = "\n\n".join(entry.render() for entry in entries)
+        if len(text) <= DESCRIPTION_LIMIT:
+            embed.description = text
+            return {"embed": embed}
+
+        embed.description = self.summarise(Counter(entry.title for entry in entries), DESCRIPTION_LIMIT)
+        return {"embed": embed, "file": discord.File(io.BytesIO(text.encode()), "logs.md")}
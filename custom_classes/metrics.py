@@ -0,0 +1,119 @@
+import asyncio
+from collections import Counter, defaultdict
+
+import aiohttp
+from aiohttp import web
+
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+def format_labels(labels, **extra):
+    labels = [*labels, *extra.items()]
+    if not labels:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in labels)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(labels, escaped)) + "}"
+
+
+def label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+class Histogram:
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.sum += value
+        self.count += 1
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+
+    def lines(self, name, labels):
+        for bound, count in zip(self.buckets, self.counts):
+            yield f"{name}_bucket{format_labels(labels, le=bound)} {count}"
+        yield f"{name}_bucket{format_labels(labels, le='+Inf')} {self.count}"
+        yield f"{name}_sum{format_labels(labels)} {self.sum}"
+        yield f"{name}_count{format_labels(labels)} {self.count}"
+
+
+class Metrics:
+    """Collects runtime numbers and renders them in the Prometheus text format"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.counters = defaultdict(Counter)
+        self.histograms = defaultdict(dict)
+        # name -> function returning a number, or a dict of label keys to numbers
+        self.gauges = {}
+        self.loop_lag = 0
+
+    def inc(self, name, value=1, **labels):
+        self.counters[name][label_key(labels)] += value
+
+    def observe(self, name, value, **labels):
+        key = label_key(labels)
+        histogram = self.histograms[name].get(key)
+        if histogram is None:
+            histogram = self.histograms[name][key] = Histogram()
+        histogram.observe(value)
+
+    def gauge(self, name, func):
+        self.gauges[name] = func
+
+    def render(self):
+        lines = []
+        for name, values in self.counters.items():
+            lines.append(f"# TYPE {name} counter")
+            lines.extend(f"{name}{format_labels(labels)} {value}" for labels, value in values.items())
+
+        for name, histograms in self.histograms.items():
+            lines.append(f"# TYPE {name} histogram")
+            for labels, histogram in histograms.items():
+                lines.extend(histogram.lines(name, labels))
+
+        for name, func in self.gauges.items():
+            value = func()
+            lines.append(f"# TYPE {name} gauge")
+            if isinstance(value, dict):
+                lines.extend(f"{name}{format_labels(labels)} {v}" for labels, v in value.items())
+            elif value is not None:
+                lines.append(f"{name} {value}")
+
+        return "\n".join(lines) + "\n"
+
+    async def handle_metrics(self, request):
+        return web.Response(text=self.render(), content_type="text/plain")
+
+    def trace_config(self):
+        """Times every request made with the aiohttp session it is given to"""
+        config = aiohttp.TraceConfig()
+
+        async def on_request_start(session, context, params):
+            context.start = self.bot.loop.time()
+
+        async def on_request_end(session, context, params):
+            self.observe("kern_http_request_duration_seconds",
+                         self.bot.loop.time() - context.start,
+                         host=params.url.host,
+                         status=params.response.status)
+
+        async def on_request_exception(session, context, params):
+            self.inc("kern_http_request_errors_total",
+                     host=params.url.host,
+                     error=type(params.exception).__name__)
+
+        config.on_request_start.append(on_request_start)
+        config.on_request_end.append(on_request_end)
+        config.on_request_exception.append(on_request_exception)
+        return config
+
+    async def measure_loop_lag(self, interval=1):
+        while not self.bot.is_closed():
+            start = self.bot.loop.time()
+            await asyncio.sleep(interval)
+            self.loop_lag = self.bot.loop.time() - start - interval
@@ -0,0 +1,132 @@
+import asyncio
+from collections import deque
+
+# Discord's bucket for creating and editing messages in a channel
+CHANNEL_RATE = 5
+CHANNEL_PER = 5
+
+
+class Operation:
+    def __init__(self, func, kwargs, merge_key, future):
+        self.func = func
+        self.kwargs = kwargs
+        self.merge_key = merge_key
+        self.future = future
+
+
+class ChannelQueue:
+    def __init__(self, loop, max_depth, on_idle):
+        self.loop = loop
+        self.on_idle = on_idle
+        self.queue = asyncio.Queue(max_depth)
+        # Operations that haven't started yet by merge key, for edits to the same message
+        self.pending = {}
+        # The most recently queued operation, edits only merge into that so nothing overtakes a later send
+        self.last = None
+        # Producers waiting for room in the queue, which come after `last`
+        self.waiting = 0
+        self.sent = deque(maxlen=CHANNEL_RATE)
+        self.worker = None
+
+    async def put(self, func, kwargs, merge_key):
+        op = self.pending.get(merge_key) if merge_key is not None else None
+        if op is not None and op is self.last and not self.waiting:
+            # Only the latest version of the message matters
+            op.kwargs.update(kwargs)
+        else:
+            op = Operation(func, kwargs, merge_key, self.loop.create_future())
+            # Waits here while the channel is backed up, the op is only visible to others once queued
+            self.waiting += 1
+            try:
+                await self.queue.put(op)
+            finally:
+                self.waiting -= 1
+            self.last = op
+            if merge_key is not None:
+                self.pending[merge_key] = op
+            if self.worker is None:
+                self.worker = self.loop.create_task(self.run())
+
+        # Shielded so a producer giving up doesn't cancel an edit other producers are waiting on
+        return await asyncio.shield(op.future)
+
+    async def run(self):
+        try:
+            while True:
+                try:
+                    # Kept for a window after the last operation so pacing carries over to the next burst
+                    op = await asyncio.wait_for(self.queue.get(), CHANNEL_PER)
+                except asyncio.TimeoutError:
+                    if self.queue.empty():
+                        break
+                    continue
+
+                try:
+                    await self.wait_for_bucket()
+                    self.started(op)
+                    op.future.set_result(await op.func(**op.kwargs))
+                except asyncio.CancelledError:
+                    op.future.cancel()
+                    raise
+                except Exception as e:
+                    op.future.set_exception(e)
+        except asyncio.CancelledError:
+            # Nothing else will run what's left, so its producers aren't left waiting forever
+            while not self.queue.empty():
+                self.queue.get_nowait().future.cancel()
+            self.pending.clear()
+            self.last = None
+            raise
+        finally:
+            self.worker = None
+        self.on_idle()
+
+    def started(self, op):
+        if op.merge_key is not None and self.pending.get(op.merge_key) is op:
+            del self.pending[op.merge_key]
+        if self.last is op:
+            self.last = None
+
+    async def wait_for_bucket(self):
+        if len(self.sent) == CHANNEL_RATE:
+            delay = self.sent[0] + CHANNEL_PER - self.loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        self.sent.append(self.loop.time())
+
+
+class OutboundQueue:
+    """Sends and edits messages one channel at a time, paced to stay within each channel's
+    rate limit rather than letting discord.py sleep on 429s. Edits to a message that are
+    waiting are merged, and producers wait once `max_depth` operations are queued for a channel"""
+
+    def __init__(self, loop, max_depth=10):
+        self.loop = loop
+        self.max_depth = max_depth
+        self.channels = {}
+
+    def channel(self, channel_id):
+        queue = self.channels.get(channel_id)
+        if queue is None:
+            queue = self.channels[channel_id] = ChannelQueue(self.loop, self.max_depth,
+                                                             lambda: self.channels.pop(channel_id, None))
+        return queue
+
+    async def send(self, channel_id, func, **kwargs):
+        return await self.channel(channel_id).put(func, kwargs, None)
+
+    async def edit(self, message, **fields):
+        return await self.channel(message.channel.id).put(message.edit, fields, ("edit", message.id))
+
+    def cancel_all(self):
+        for queue in list(self.channels.values()):
+            if queue.worker is not None:
+                queue.worker.cancel()
+
+    @property
+    def depth(self):
+        return sum(queue.queue.qsize() for queue in self.channels.values())
+
+    @property
+    def max_channel_depth(self):
+        return max((queue.queue.qsize() for queue in self.channels.values()), default=0)
@@ -0,0 +1,95 @@
+from abc import ABC, abstractmethod
+from math import ceil
+
+
+class PageSource(ABC):
+    """Renders a paginator's pages when they're first shown, then keeps them.
+    `page_count` is None while the number of pages isn't known yet"""
+
+    def __init__(self):
+        self.pages = {}
+
+    @property
+    @abstractmethod
+    def page_count(self):
+        pass
+
+    async def get_page(self, number):
+        """The embed for page `number` (from 1), or None if there isn't one"""
+        if number < 1:
+            return None
+        if number not in self.pages:
+            page = await self.render_page(number)
+            if page is None:
+                return None
+            self.pages[number] = page
+        return self.pages[number]
+
+    @abstractmethod
+    async def render_page(self, number):
+        """The embed for page `number`, or None if there isn't one"""
+
+
+class ListPageSource(PageSource):
+    """Splits `entries` into pages of `per_page`, each only made into an embed by
+    `format_page(entries, number)` once it's shown"""
+
+    def __init__(self, entries, per_page, format_page):
+        super().__init__()
+        self.entries = entries
+        self.per_page = per_page
+        self.format_page = format_page
+
+    @property
+    def page_count(self):
+        return max(1, ceil(len(self.entries) / self.per_page))
+
+    async def render_page(self, number):
+        if number > self.page_count:
+            return None
+        start = (number - 1) * self.per_page
+        return self.format_page(self.entries[start:start + self.per_page], number)
+
+
+class EmbedPageSource(ListPageSource):
+    """Embeds that were built up front, one per page"""
+
+    def __init__(self, embeds):
+        super().__init__(embeds, 1, lambda entries, _: entries[0])
+
+
+class IteratorPageSource(PageSource):
+    """Pages of `per_page` items pulled from an iterator or async iterator as they're needed,
+    for results whose size isn't known up front. The page count is known once it runs out"""
+
+    def __init__(self, iterator, per_page, format_page):
+        super().__init__()
+        self.iterator = iterator.__aiter__() if hasattr(iterator, "__aiter__") else iter(iterator)
+        self.per_page = per_page
+        self.format_page = format_page
+        self.items = []
+        self.exhausted = False
+
+    @property
+    def page_count(self):
+        if not self.exhausted:
+            return None
+        return max(1, ceil(len(self.items) / self.per_page))
+
+    async def fill(self, count):
+        while not self.exhausted and len(self.items) < count:
+            try:
+                if hasattr(self.iterator, "__anext__"):
+                    self.items.append(await self.iterator.__anext__())
+                else:
+                    self.items.append(next(self.iterator))
+            except (StopIteration, StopAsyncIteration):
+                self.exhausted = True
+
+    async def render_page(self, number):
+        # One item past the page, so it's known whether this is the last one
+        await self.fill(number * self.per_page + 1)
+        start = (number - 1) * self.per_page
+        if number > 1 and start >= len(self.items):
+            return None
+        return self.format_page(self.items[start:start + self.per_page], number)
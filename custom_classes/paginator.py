@@ -1,69 +1,46 @@
 import asyncio
-from collections import defaultdict
 
 import discord
 
-import custom_classes as cc
-
-
-def _check(command_):
-    return True
-
-
-async def filter_commands(ctx, long_doc, check):
-    cogs_dict = defaultdict(list)
-
-    for command in set(ctx.bot.walk_commands()):
-        if not command.hidden and await cc.safe_can_run(command, ctx) and check(command):
-            long_help = f"{command.help or ''}\n```{command.signature}```"
-            description = long_help if long_doc else command.short_doc
-            cogs_dict[command.cog_name or "No Category"].append({
-                "name": command.qualified_name,
-                "value": description or "No description.",
-                "inline": False,
-            })
-
-    return {k: sorted(cogs_dict[k], key=lambda c: c["name"])
-            for k in sorted(cogs_dict.keys())}
+from .page_source import EmbedPageSource, ListPageSource
 
 
 class Paginator:
     @classmethod
     async def from_commands(cls, ctx, base_embed=None, emojis=None, max_fields=5,
-                            initial_page=1, long_doc=False, check=_check,
+                            initial_page=1, long_doc=False, check=None,
                             include_base_embed=True):
         if base_embed is None:
             base_embed = discord.Embed()
 
+        pages = await ctx.bot.help_index.get_pages(ctx, long_doc, max_fields, check)
         if include_base_embed:
-            embeds = [base_embed]
-        else:
-            embeds = []
+            pages = [base_embed] + pages
 
         base_embed_dict = base_embed.to_dict()
         base_embed_dict.pop("fields", None)
         base_embed_dict.pop("description", None)
-        total_commands = 0
-
-        for cog, commands in (await filter_commands(ctx, long_doc, check)).items():
-            for index, chunk in enumerate(cc.chunks(commands, max_fields)):
-                embed = discord.Embed.from_dict(base_embed_dict)
-                embed.title = f"{base_embed.title} - {cog} ({index + 1})"
-
-                for command in chunk:
-                    total_commands += 1
-                    embed.add_field(**command)
-
-                embeds.append(embed)
 
+        def format_page(entries, _):
+            if not entries or entries[0] is base_embed:
+                return base_embed
+            cog, index, fields = entries[0]
+            embed = discord.Embed.from_dict(base_embed_dict)
+            embed.title = f"{base_embed.title} - {cog} ({index + 1})"
+            for field in fields:
+                embed.add_field(**field)
+            return embed
+
+        total_commands = sum(len(page[2]) for page in pages if page is not base_embed)
         # noinspection PyProtectedMember
         getattr(base_embed, "_footer", {})["text"] = f"{total_commands} commands"
-        return cls(ctx, embeds, emojis, initial_page)
+        return cls(ctx, emojis=emojis, initial_page=initial_page, source=ListPageSource(pages, 1, format_page))
 
-    def __init__(self, ctx, embeds, emojis=None, initial_page=1):
+    def __init__(self, ctx, embeds=None, emojis=None, initial_page=1, source=None):
+        """Pages come from `source`, a PageSource, or else are the prebuilt `embeds`"""
         self.ctx = ctx
         self.bot = ctx.bot
-        self.embeds = embeds
+        self.source = source or EmbedPageSource(embeds)
         self.message = None
         self.current_page = initial_page
         self.closed = False
@@ -77,31 +54,24 @@ class Paginator:
              "⏹": self.exit,
         }
 
-    async def add_reactions(self):
-        if len(self.embeds) == 1:
+    async def start_paginating(self):
+        self.message = await self.ctx.send(embed=await self.source.get_page(self.current_page))
+        if self.source.page_count == 1:
             self.closed = True
             return
 
-        while not self.message:
-            await asyncio.sleep(0.1)
-        for emoji in self.emojis:
-            await self.message.add_reaction(emoji)
-
-    async def start_paginating(self):
-        self.bot.loop.create_task(self.add_reactions())
-        self.message = await self.ctx.send(embed=self.embeds[
-                                           self.current_page - 1])
+        # Placed in the background so the menu can be used before every reaction is there
+        placing = self.bot.reaction_placer.place(self.message, self.emojis)
 
-        def check(reaction, member):
-            return str(reaction) in self.emojis and \
-                   member == self.ctx.author and \
-                   reaction.message.id == self.message.id
+        def check(reaction, _):
+            return str(reaction) in self.emojis
 
         while not self.closed:
             try:
-                emoji, user = await self.bot.wait_for("reaction_add",
-                                                      timeout=20,
-                                                      check=check)
+                emoji, user = await self.bot.waiters.wait_for("reaction_add",
+                                                              (self.message.id, self.ctx.author.id),
+                                                              timeout=20,
+                                                              check=check)
 
                 if await self.emojis.get(str(emoji), self.null)():
                     break
@@ -113,41 +83,47 @@ class Paginator:
             except discord.Forbidden:
                 pass
 
+        placing.cancel()
         if not self.closed:
             try:
                 await self.message.clear_reactions()
             except discord.Forbidden:
                 await self.message.delete()
-                await self.ctx.send(embed=self.embeds[self.current_page - 1])
+                await self.ctx.send(embed=await self.source.get_page(self.current_page))
 
         self.closed = True
 
     async def go_to_page(self, number):
-        await self.message.edit(embed=self.embeds[number - 1])
+        """Shows page `number`, returning False if there's no such page"""
+        page = await self.source.get_page(number)
+        if page is None:
+            return False
+        self.current_page = number
+        await self.ctx.edit(self.message, embed=page)
+        return True
 
     async def first(self):
         await self.go_to_page(1)
 
     async def previous_page(self):
         if self.current_page != 1:
-            self.current_page -= 1
-            await self.go_to_page(self.current_page)
+            await self.go_to_page(self.current_page - 1)
 
     async def next_page(self):
-        if self.current_page != len(self.embeds):
-            self.current_page += 1
-            await self.go_to_page(self.current_page)
+        if self.current_page != self.source.page_count:
+            await self.go_to_page(self.current_page + 1)
 
     async def last(self):
-        await self.go_to_page(len(self.embeds))
+        # Unknown until an unbounded source has been read to the end
+        if self.source.page_count is not None:
+            await self.go_to_page(self.source.page_count)
 
     async def number(self):
         temp_message = await self.ctx.send("Which page do you want to go to?")
 
-        def check(message_):
-            return message_.author == self.ctx.author
-
-        message = await self.bot.wait_for("message", timeout=20, check=check)
+        message = await self.bot.waiters.wait_for("message",
+                                                  (self.ctx.channel.id, self.ctx.author.id),
+                                                  timeout=20)
         try:
             number = int(message.content)
         except ValueError:
@@ -157,12 +133,9 @@ class Paginator:
             await temp_message.delete()
             return
 
-        if 0 < number <= len(self.embeds):
-            await self.go_to_page(number)
-
-        else:
+        if not await self.go_to_page(number):
             await self.ctx.error(f"Number is not in range `0 < n <= "
-                                 f"{len(self.embeds)}`",
+                                 f"{self.source.page_count or '?'}`",
                                  "Invalid Input",
                                  delete_after=5)
 
@@ -0,0 +1,120 @@
+import io
+import os
+import re
+from abc import ABC, abstractmethod
+from hashlib import sha256
+
+import discord
+from aiohttp import web
+
+from .utils import write_atomic
+
+DIGEST = re.compile(r"^[0-9a-f]{16}$")
+
+
+class Paste:
+    """Where a long output ended up: a `link` to it, or a `file` to attach in its place"""
+
+    def __init__(self, digest, link=None, file=None):
+        self.digest = digest
+        self.link = link
+        self.file = file
+
+
+class PasteStore(ABC):
+    """Somewhere to put outputs too long for a message. Identical content is only stored once"""
+
+    def __init__(self):
+        self.links = {}
+
+    @staticmethod
+    def digest(content):
+        return sha256(content.encode()).hexdigest()[:16]
+
+    async def paste(self, content):
+        digest = self.digest(content)
+        link = self.links.get(digest)
+        if link is None:
+            link = await self.store(digest, content)
+            if link is not None:
+                self.links[digest] = link
+        if link is None:
+            return Paste(digest, file=discord.File(io.BytesIO(content.encode()), f"{digest}.md"))
+        return Paste(digest, link)
+
+    @abstractmethod
+    async def store(self, digest, content):
+        """Returns a link to the stored content, or None to attach it as a file instead"""
+
+    def sent(self, message):
+        """Called with each message sent with attachments, in case any are pastes"""
+        pass
+
+
+class AttachmentPasteStore(PasteStore):
+    """Attaches the output to the message, later pastes of the same content link to that attachment"""
+
+    async def store(self, digest, content):
+        return None
+
+    def sent(self, message):
+        for attachment in message.attachments:
+            digest, _ = os.path.splitext(attachment.filename)
+            if DIGEST.match(digest):
+                self.links[digest] = attachment.url
+
+
+class LocalPasteStore(PasteStore):
+    """Saves outputs to `directory`, served at /pastes/<digest> by the bot's web server"""
+
+    def __init__(self, bot, public_url, directory="pastes"):
+        super().__init__()
+        self.bot = bot
+        self.public_url = public_url.rstrip("/")
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        bot.web_app.router.add_get("/pastes/{digest}", self.handle_paste)
+
+    def path(self, digest):
+        return os.path.join(self.directory, f"{digest}.md")
+
+    async def store(self, digest, content):
+        await self.bot.loop.run_in_executor(None, self._write, self.path(digest), content)
+        return f"{self.public_url}/pastes/{digest}"
+
+    @staticmethod
+    def _write(path, content):
+        # Still there from an earlier run
+        if not os.path.exists(path):
+            write_atomic(path, content)
+
+    async def handle_paste(self, request):
+        digest = request.match_info["digest"]
+        if not DIGEST.match(digest) or not os.path.exists(self.path(digest)):
+            raise web.HTTPNotFound()
+        return web.FileResponse(self.path(digest), headers={"Content-Type": "text/plain; charset=utf-8"})
+
+
+class GistPasteStore(PasteStore):
+    """Uploads outputs as GitHub gists"""
+
+    def __init__(self, bot):
+        super().__init__()
+        self.bot = bot
+
+    async def store(self, digest, content):
+        json = {"files": {"output.md": {"content": content}}}
+        r = await self.bot.http_client.post("https://api.github.com/gists", json=json, auth=self.bot.github_auth)
+        return r.json()["html_url"]
+
+
+def create_paste_store(bot, backend, public_url=None):
+    if backend == "attachment":
+        return AttachmentPasteStore()
+    if backend == "gist":
+        return GistPasteStore(bot)
+    if backend == "local":
+        if public_url is None or bot.web_port is None:
+            raise ValueError("The local paste store needs WEB_PORT and PUBLIC_URL to be set")
+        return LocalPasteStore(bot, public_url)
+    raise ValueError(f"Unknown paste backend {backend}")
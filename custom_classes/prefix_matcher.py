@@ -0,0 +1,37 @@
+import re
+
+
+class PrefixMatcher:
+    """Matches the start of a message against the default prefixes, a guild's
+    prefixes and the bot's mention with a single compiled regex"""
+
+    def __init__(self, default_prefixes, guild_prefixes=()):
+        self.default_prefixes = list(default_prefixes)
+        self.prefixes = list(dict.fromkeys(guild_prefixes))
+        self.pattern = None
+        self.first_chars = frozenset()
+        self.compile()
+
+    def compile(self):
+        alternatives = {p for prefix in [*self.default_prefixes, *self.prefixes]
+                        for p in (prefix, prefix.upper()) if p}
+        # Alternation takes the first branch that matches, so longest goes first
+        escaped = "|".join(re.escape(p) for p in sorted(alternatives, key=len, reverse=True))
+
+        pattern = r"<@!?(?P<mention>\d+)> "
+        if escaped:
+            pattern += rf"|(?:{escaped}) ?"
+        self.pattern = re.compile(pattern)
+        self.first_chars = frozenset(p[0] for p in alternatives) | {"<"}
+
+    def match(self, content, user_id):
+        """Returns the prefix `content` starts with, or None"""
+        if content[:1] not in self.first_chars:
+            return None
+        match = self.pattern.match(content)
+        if match is None:
+            return None
+        mention = match.group("mention")
+        if mention is not None and int(mention) != user_id:
+            return None
+        return match.group(0)
@@ -0,0 +1,35 @@
+import discord
+
+
+class ReactionPlacer:
+    """Adds reactions to messages in the background.
+    Each message's reactions are added in order, with no delay of our own between them: discord.py's
+    rate limiter waits only when the channel's bucket is used up. Messages are handled concurrently"""
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.tasks = set()
+        self.placed = 0
+
+    def place(self, message, emojis):
+        """Starts adding `emojis` to `message`. Cancel the returned task to stop early"""
+        task = self.loop.create_task(self._place(message, list(emojis)))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return task
+
+    async def _place(self, message, emojis):
+        for emoji in emojis:
+            try:
+                await message.add_reaction(emoji)
+            except (discord.NotFound, discord.Forbidden):
+                # Deleted, or we can't react there, so there's no point trying the rest
+                return
+            self.placed += 1
+
+    def cancel_all(self):
+        for task in self.tasks:
+            task.cancel()
+
+    def __len__(self):
+        return len(self.tasks)
@@ -0,0 +1,48 @@
+from collections import Counter, OrderedDict
+from time import monotonic
+from urllib.parse import urlparse
+
+# Seconds responses from each host are kept for, hosts not listed aren't cached
+HOST_TTLS = {
+    "od-api.oxforddictionaries.com": 24 * 60 * 60,
+    "www.youtube.com": 10 * 60,
+    "min-api.cryptocompare.com": 60,
+}
+
+
+class ResponseCache:
+    """A bounded cache of FetchedResponses with a TTL per host, evicting the least recently used"""
+
+    def __init__(self, max_entries=512, host_ttls=None):
+        self.max_entries = max_entries
+        self.host_ttls = host_ttls or HOST_TTLS
+        self.entries = OrderedDict()
+        self.stats = Counter()
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.stats["miss"] += 1
+            return None
+
+        expires, response = entry
+        if expires < monotonic():
+            del self.entries[key]
+            self.stats["expired"] += 1
+            self.stats["miss"] += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.stats["hit"] += 1
+        return response
+
+    def put(self, key, url, response):
+        ttl = self.host_ttls.get(urlparse(url).hostname)
+        if ttl is None or response.status != 200:
+            return
+
+        self.entries[key] = (monotonic() + ttl, response)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.stats["eviction"] += 1
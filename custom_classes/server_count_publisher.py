@@ -0,0 +1,71 @@
+import asyncio
+from datetime import datetime
+
+import async_timeout
+
+DBOTS_STATS_URL = "https://discordbots.org/api/bots/{}/stats"
+
+
+class ServerCountPublisher:
+    """Posts the server count to discordbots.org in the background.
+    Changes are coalesced, and posted at most once every `interval` seconds with the latest count"""
+
+    def __init__(self, bot, token, interval=300):
+        self.bot = bot
+        self.token = token
+        self.interval = interval
+        self.changed = asyncio.Event()
+        self.task = None
+
+        self.last_publish = None
+        self.last_count = None
+        self.last_error = None
+        self.publishes = 0
+
+    @property
+    def enabled(self):
+        # Every cluster knows the total, so only the first one posts it
+        return self.token and (self.bot.cluster is None or self.bot.cluster.cluster_id == 0)
+
+    def notify(self):
+        """Marks the count as changed, it's posted once the current window ends"""
+        if self.enabled:
+            self.changed.set()
+
+    def start(self):
+        if self.enabled:
+            self.task = self.bot.loop.create_task(self.run())
+
+    def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+
+    async def run(self):
+        while not self.bot.is_closed():
+            await self.changed.wait()
+            if self.last_publish is not None:
+                elapsed = (datetime.utcnow() - self.last_publish).total_seconds()
+                await asyncio.sleep(max(0, self.interval - elapsed))
+            # Cleared after the wait, so everything that changed during it is sent in this one post
+            self.changed.clear()
+            await self.publish()
+
+    async def publish(self):
+        count = self.bot.guild_count
+        url = DBOTS_STATS_URL.format(self.bot.user.id)
+        try:
+            with async_timeout.timeout(10):
+                resp = await self.bot.http_client.post(url, data={"server_count": count},
+                                                       headers={"Authorization": self.token})
+            if resp.status >= 400:
+                raise ValueError(f"{resp.url} returned error code {resp.status}")
+        except Exception as e:
+            self.last_error = f"{type(e).__name__}: {e}"
+            # Retried once the next window ends
+            self.changed.set()
+        else:
+            self.last_count = count
+            self.last_error = None
+            self.publishes += 1
+        finally:
+            self.last_publish = datetime.utcnow()
@@ -0,0 +1,49 @@
+import json
+from time import time
+
+from .utils import write_atomic
+
+# Bump when the shape of any saved data set changes, so old snapshots are ignored
+SNAPSHOT_VERSION = 1
+
+HOUR = 60 * 60
+DATASET_TTLS = {
+    "demotivators": 7 * 24 * HOUR,
+    "trivia_categories": 7 * 24 * HOUR,
+    "coins": 24 * HOUR,
+    "forecast": 3 * HOUR,
+    "documentation": 7 * 24 * HOUR,
+}
+
+
+class Snapshot:
+    """A versioned copy of the bot's data sets on disk, each expiring after its own TTL"""
+
+    def __init__(self, path, ttls=None):
+        self.path = path
+        self.ttls = ttls or DATASET_TTLS
+        self.datasets = {}
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if snapshot.get("version") == SNAPSHOT_VERSION:
+            self.datasets = snapshot["datasets"]
+
+    def fresh(self, name):
+        """Returns the saved data set, or None if it is missing or has expired"""
+        entry = self.datasets.get(name)
+        if entry is None or time() - entry["saved"] > self.ttls[name]:
+            return None
+        return entry["data"]
+
+    def update(self, name, data):
+        self.datasets[name] = {"saved": time(), "data": data}
+
+    async def save(self, loop):
+        content = json.dumps({"version": SNAPSHOT_VERSION, "datasets": self.datasets})
+        await loop.run_in_executor(None, write_atomic, self.path, content)
@@ -0,0 +1,67 @@
+import ast
+import builtins
+import inspect
+import textwrap
+import weakref
+
+# (weak reference to the code object, SourceEntry) by the code object's id. Keyed on identity since
+# code objects compare equal across edits that only change comments, and dropped with the code object
+# once a reload replaces it
+_entries = {}
+
+
+def dotted_name(node):
+    """`commands.BadArgument` for the AST of that expression, None if it isn't a plain (dotted) name"""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        parent = dotted_name(node.value)
+        return parent and f"{parent}.{node.attr}"
+    return None
+
+
+def resolve_name(name, namespace):
+    """Looks a dotted name up in a module's globals (then builtins), None if it doesn't exist"""
+    first, *attrs = name.split(".")
+    obj = namespace.get(first, getattr(builtins, first, None))
+    for attr in attrs:
+        obj = getattr(obj, attr, None)
+    return obj
+
+
+class SourceEntry:
+    """The source of a function, and the names of the exceptions it handles if it's an error handler"""
+
+    def __init__(self, code):
+        self.lines, self.firstlineno = inspect.getsourcelines(code)
+        self._handled_error_names = None
+
+    @property
+    def handled_error_names(self):
+        """Names from the `isinstance` checks of the if/elif chain after an error handler's first line"""
+        if self._handled_error_names is None:
+            tree = ast.parse(textwrap.dedent("".join(self.lines)))
+            body = tree.body[0].body
+            names = []
+            node = body[1] if len(body) > 1 else None
+            while isinstance(node, ast.If):
+                test = node.test
+                if isinstance(test, ast.Call) and dotted_name(test.func) == "isinstance" and len(test.args) == 2:
+                    for error in getattr(test.args[1], "elts", [test.args[1]]):
+                        name = dotted_name(error)
+                        if name is not None:
+                            names.append(name)
+                node = node.orelse[0] if node.orelse else None
+            self._handled_error_names = names
+        return self._handled_error_names
+
+
+def get_source(code):
+    key = id(code)
+    cached = _entries.get(key)
+    if cached is not None and cached[0]() is code:
+        return cached[1]
+
+    entry = SourceEntry(code)
+    _entries[key] = (weakref.ref(code, lambda _: _entries.pop(key, None)), entry)
+    return entry
@@ -0,0 +1,57 @@
+import json
+from contextlib import contextmanager
+from datetime import datetime
+from time import time
+
+import psutil
+
+
+class StartupTimeline:
+    """Records how long each phase of start-up took, and how much memory it used.
+    Times are in seconds since the process started"""
+
+    def __init__(self):
+        self.process = psutil.Process()
+        self.started = self.process.create_time()
+        self.phases = []
+        self.marks = {}
+
+    def _rss(self):
+        return self.process.memory_info().rss
+
+    def record(self, name, start, duration, memory_delta=None):
+        self.phases.append({
+            "name": name,
+            "start": round(start - self.started, 4),
+            "duration": round(duration, 4),
+            "memory_delta": memory_delta,
+        })
+
+    @contextmanager
+    def phase(self, name):
+        start = time()
+        rss = self._rss()
+        try:
+            yield
+        finally:
+            self.record(name, start, time() - start, self._rss() - rss)
+
+    def mark(self, name):
+        """Records a point in time (e.g. the gateway READY) the first time it happens"""
+        self.marks.setdefault(name, round(time() - self.started, 4))
+
+    def to_dict(self):
+        return {
+            "booted_at": datetime.utcfromtimestamp(self.started).isoformat(),
+            "phases": self.phases,
+            "marks": self.marks,
+        }
+
+    async def save(self, path, loop):
+        content = json.dumps(self.to_dict(), indent=4)
+        await loop.run_in_executor(None, self._write, path, content)
+
+    @staticmethod
+    def _write(path, content):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
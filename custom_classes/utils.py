@@ -1,3 +1,6 @@
+import os
+import tempfile
+
 from discord.ext import commands
 
 
@@ -6,3 +9,17 @@ async def safe_can_run(command: commands.Command, ctx):
         return await command.can_run(ctx)
     except commands.CommandError:
         return False
+
+
+def write_atomic(path, content):
+    """Writes `content` to a temporary file first so a crash never leaves half a file,
+    named per write so cluster workers sharing a directory don't write over each other's"""
+    directory, name = os.path.split(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=name + ".", suffix=".tmp", dir=directory)
+    try:
+        with open(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
@@ -0,0 +1,78 @@
+import asyncio
+from collections import defaultdict
+
+
+def reaction_key(reaction, user):
+    return reaction.message.id, user.id
+
+
+def message_key(message):
+    return message.channel.id, message.author.id
+
+
+# How each event is indexed: (message id, user id) for reactions, (channel id, author id) for messages
+EVENT_KEYS = {
+    "reaction_add": reaction_key,
+    "reaction_remove": reaction_key,
+    "message": message_key,
+}
+
+
+class WaiterRegistry:
+    """Futures waiting for an event, indexed by the key in EVENT_KEYS. Unlike `Bot.wait_for`,
+    an event only runs the checks of the waiters for its own message/channel and user"""
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.waiters = defaultdict(list)
+
+    def wait(self, event, key, check=None):
+        """Returns a future for the next `event` with `key` that passes `check`.
+        It must be `discard`ed once it's no longer wanted"""
+        future = self.loop.create_future()
+        self.waiters[(event, key)].append((future, check))
+        return future
+
+    def discard(self, event, key, future):
+        waiters = [w for w in self.waiters.get((event, key), ()) if w[0] is not future]
+        if waiters:
+            self.waiters[(event, key)] = waiters
+        else:
+            self.waiters.pop((event, key), None)
+
+    async def wait_for(self, event, key, *, check=None, timeout=None):
+        future = self.wait(event, key, check)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self.discard(event, key, future)
+
+    def dispatch(self, event, *args):
+        get_key = EVENT_KEYS.get(event)
+        if get_key is None:
+            return
+        full_key = (event, get_key(*args))
+        if full_key not in self.waiters:
+            return
+
+        # Same as Bot.wait_for, a single argument isn't wrapped in a tuple
+        result = args[0] if len(args) == 1 else args
+        remaining = []
+        for future, check in self.waiters.pop(full_key):
+            if future.done():
+                continue
+            try:
+                matched = check is None or check(*args)
+            except Exception as e:
+                future.set_exception(e)
+                continue
+            if matched:
+                future.set_result(result)
+            else:
+                remaining.append((future, check))
+
+        if remaining:
+            self.waiters[full_key] = remaining
+
+    def __len__(self):
+        return sum(len(w) for w in self.waiters.values())
@@ -0,0 +1,166 @@
+"""Runs the bot as a cluster of worker processes, each connected to a range of shards.
+
+Each worker is a normal `main.py` process, told its shards through the environment.
+Workers talk to this supervisor over a local socket, which relays owner commands
+and aggregates guild/member counts so each worker can report bot-wide numbers.
+"""
+import asyncio
+import json
+import os
+import signal
+import sys
+from os import cpu_count, environ
+
+import aiohttp
+from dotenv import load_dotenv
+
+from custom_classes.cluster import IPC_HOST, encode
+
+GATEWAY_URL = "https://discordapp.com/api/v7/gateway/bot"
+ROOT = os.path.dirname(os.path.abspath(__file__))
+# How long workers get to close their connections before they're killed
+SHUTDOWN_TIMEOUT = 30
+
+
+async def get_shard_count(token):
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with session.get(GATEWAY_URL, headers={"Authorization": f"Bot {token}"}) as resp:
+                if resp.status == 401:
+                    raise SystemExit("Discord rejected the bot token, check TOKEN in .env")
+                if resp.status >= 400:
+                    raise SystemExit(f"Couldn't get the shard count, Discord returned error code {resp.status}")
+                return (await resp.json())["shards"]
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        raise SystemExit(f"Couldn't reach Discord to get the shard count: {type(e).__name__}: {e}")
+
+
+def split_shards(shard_count, processes):
+    """Splits the shard ids into `processes` contiguous ranges"""
+    processes = min(processes, shard_count)
+    size, extra = divmod(shard_count, processes)
+    ranges = []
+    start = 0
+    for index in range(processes):
+        end = start + size + (index < extra)
+        ranges.append(list(range(start, end)))
+        start = end
+    return ranges
+
+
+class Supervisor:
+    def __init__(self, token, processes, port):
+        self.token = token
+        self.processes = processes
+        self.port = port
+        self.closing = False
+
+        self.writers = {}
+        self.stats = {}
+        self.workers = {}
+        self.stopping = None
+
+    async def start(self):
+        loop = asyncio.get_event_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.on_signal)
+            except NotImplementedError:
+                # Windows, where the workers are stopped on KeyboardInterrupt instead
+                pass
+
+        server = await asyncio.start_server(self.handle_worker, IPC_HOST, self.port)
+        shard_count = await get_shard_count(self.token)
+        clusters = split_shards(shard_count, self.processes)
+        print(f"Starting {len(clusters)} clusters for {shard_count} shards")
+
+        await asyncio.gather(*[self.run_worker(cluster_id, shard_ids, shard_count)
+                               for cluster_id, shard_ids in enumerate(clusters)])
+        server.close()
+        if self.stopping is not None:
+            await self.stopping
+
+    def on_signal(self):
+        if self.stopping is None:
+            self.stopping = asyncio.ensure_future(self.stop())
+
+    async def run_worker(self, cluster_id, shard_ids, shard_count):
+        env = {
+            **environ,
+            "CLUSTER_ID": str(cluster_id),
+            "CLUSTER_IPC_PORT": str(self.port),
+            "SHARD_IDS": ",".join(map(str, shard_ids)),
+            "SHARD_COUNT": str(shard_count),
+        }
+        while not self.closing:
+            process = await asyncio.create_subprocess_exec(sys.executable, os.path.join(ROOT, "main.py"),
+                                                           env=env, cwd=ROOT)
+            self.workers[cluster_id] = process
+            code = await process.wait()
+            self.workers.pop(cluster_id, None)
+            # Its guilds are counted again once the restarted worker reports in
+            if self.stats.pop(cluster_id, None) is not None:
+                self.send_totals()
+            if not self.closing:
+                print(f"Cluster {cluster_id} exited with code {code}, restarting")
+                await asyncio.sleep(5)
+
+    async def stop(self):
+        """Terminates every worker, which closes its bot on SIGTERM, and waits for them to exit"""
+        self.closing = True
+        processes = list(self.workers.values())
+        for process in processes:
+            if process.returncode is None:
+                process.terminate()
+        try:
+            await asyncio.wait_for(asyncio.gather(*(p.wait() for p in processes)), SHUTDOWN_TIMEOUT)
+        except asyncio.TimeoutError:
+            for process in processes:
+                if process.returncode is None:
+                    print(f"Killing worker {process.pid}, it didn't exit in time")
+                    process.kill()
+            await asyncio.gather(*(p.wait() for p in processes))
+
+    def send_all(self, message, exclude=None):
+        for cluster_id, writer in list(self.writers.items()):
+            if cluster_id != exclude:
+                writer.write(message)
+
+    def send_totals(self):
+        self.send_all(encode("totals",
+                             guilds=sum(s["guilds"] for s in self.stats.values()),
+                             members=sum(s["members"] for s in self.stats.values()),
+                             clusters=len(self.stats)))
+
+    async def handle_worker(self, reader, writer):
+        cluster_id = None
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+
+            data = json.loads(line)
+            cluster_id = data["cluster"]
+            self.writers[cluster_id] = writer
+
+            if data["op"] == "stats":
+                self.stats[cluster_id] = data
+                self.send_totals()
+            elif data["op"] == "broadcast":
+                if data["command"] == "shutdown":
+                    self.closing = True
+                self.send_all(line, exclude=cluster_id)
+
+        self.writers.pop(cluster_id, None)
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    supervisor = Supervisor(environ["TOKEN"],
+                            int(environ.get("CLUSTER_PROCESSES", cpu_count())),
+                            int(environ.get("CLUSTER_IPC_PORT", 8765)))
+    loop = asyncio.get_event_loop()
+    try:
+        loop.run_until_complete(supervisor.start())
+    except KeyboardInterrupt:
+        loop.run_until_complete(supervisor.stop())
@@ -1,39 +1,34 @@
-import asyncio
 import traceback
 import warnings
-from datetime import datetime, timedelta
+from datetime import datetime
 from os import environ
 from platform import python_version
 
 import discord
 from discord.ext import commands
 from dotenv import load_dotenv
-from pkg_resources import get_distribution
 
 import custom_classes as cc
 
+pkg_resources = cc.lazy_import("pkg_resources")
+
 warnings.filterwarnings("ignore", category=UserWarning, module="fuzzywuzzy")
 
 
-def server_prefix(default_prefixes: list):
-    async def get_prefix(bots: cc.KernBot, message: discord.Message):
-        if message.guild and bots.prefixes_cache.get(message.guild.id) is None:
+async def get_prefix(bots: cc.KernBot, message: discord.Message):
+    guild_id = message.guild.id if message.guild else None
+    matcher = bots.prefixes_cache.get(guild_id)
+    bots.metrics.inc("kern_cache_requests_total", cache="prefixes", result="miss" if matcher is None else "hit")
+    if matcher is None:
+        # Once every guild's prefixes are loaded in bulk, a miss means the guild has none
+        if guild_id and not bots.database.prefixes_loaded:
             guild_prefixes = await bots.database.get_prefixes(message)
-            bots.prefixes_cache[message.guild.id] = list(set(guild_prefixes))
         else:
             guild_prefixes = []
+        matcher = bots.cache_prefixes(guild_id, guild_prefixes)
 
-        prefixes = []
-        for prefix in sorted([*default_prefixes,
-                              *guild_prefixes], key=lambda x: len(x)):
-            prefixes.append(prefix + " ")
-            prefixes.append(prefix.upper() + "")
-            prefixes.append(prefix)
-            prefixes.append(prefix.upper())
-
-        return commands.when_mentioned_or(*prefixes)(bots, message)
-
-    return get_prefix
+    # Falling back to a prefix the content doesn't start with makes discord.py treat it as no prefix
+    return matcher.match(message.content, bots.user.id) or bots.default_prefixes[0]
 
 
 load_dotenv()
@@ -43,9 +38,26 @@ token = environ["TOKEN"]
 name = environ["BOT_NAME"]
 default_prefixes = environ["BOT_PREFIXES"].split(", ")
 dbl_token = environ["DBL_TOKEN"]
+dbots_interval = int(environ.get("DBOTS_INTERVAL", 300))
 github_auth = environ["GITHUB_AUTH"].split(":")
 testing = bool(environ.get("TESTING", ""))
 log_channel = int(environ["LOG_CHANNEL"])
+chain_concurrency = int(environ.get("CHAIN_CONCURRENCY", 1))
+web_host = environ.get("WEB_HOST", "0.0.0.0")
+paste_backend = environ.get("PASTE_BACKEND", "gist")
+public_url = environ.get("PUBLIC_URL")
+
+# Set by launcher.py when this process is one worker of a cluster
+cluster_id = int(environ["CLUSTER_ID"]) if "CLUSTER_ID" in environ else None
+cluster_port = int(environ.get("CLUSTER_IPC_PORT", 0))
+# Running main.py directly stays a single unsharded bot, as it was before the launcher
+sharding = {}
+if cluster_id is not None:
+    sharding = {"shard_ids": [int(i) for i in environ["SHARD_IDS"].split(",")],
+                "shard_count": int(environ["SHARD_COUNT"])}
+
+# Every worker gets the same WEB_PORT from launcher.py, so each serves on WEB_PORT + its cluster id
+web_port = int(environ["WEB_PORT"]) + (cluster_id or 0) if "WEB_PORT" in environ else None
 
 description = f"""Kern is a discord bot by Modelmat#8218.
 
@@ -55,19 +67,30 @@ It is in active development and as such any errors found can be reported to the
 
 """
 
-bot = cc.KernBot(
+bot = (cc.ShardedKernBot if cluster_id is not None else cc.KernBot)(
     github_auth,
     log_channel,
-    command_prefix=server_prefix(default_prefixes),
+    default_prefixes=default_prefixes,
+    command_prefix=get_prefix,
     case_insensitive=True,
     description=description,
     activity=discord.Game(name="Start-up 101"),
-    testing=testing)
+    testing=testing,
+    chain_concurrency=chain_concurrency,
+    cluster_id=cluster_id,
+    cluster_port=cluster_port,
+    **sharding,
+    web_port=web_port,
+    web_host=web_host,
+    dbl_token=dbl_token,
+    dbots_interval=dbots_interval,
+    paste_backend=paste_backend,
+    public_url=public_url)
 
 
 @bot.event
 async def on_connect():
-    await bot.update_dbots_server_count(dbl_token)
+    bot.server_count_publisher.notify()
 
 
 @bot.event
@@ -77,8 +100,9 @@ async def on_guild_join(guild: discord.Guild):
                                       datetime.utcnow().strftime('%H:%M:%S UTC')),
         colour=discord.Colour.green(),
         timestamp=datetime.utcnow())
-    await bot.logs.send(embed=e)
-    await bot.update_dbots_server_count(dbl_token)
+    bot.log_sink.log(embed=e)
+    await bot.publish_cluster_stats()
+    bot.server_count_publisher.notify()
 
 
 @bot.event
@@ -88,15 +112,17 @@ async def on_guild_remove(guild: discord.Guild):
                                     datetime.utcnow().strftime('%H:%M:%S UTC')),
         colour=discord.Colour.red(),
         timestamp=datetime.utcnow())
-    await bot.logs.send(embed=e)
-    await bot.update_dbots_server_count(dbl_token)
+    bot.log_sink.log(embed=e)
+    await bot.publish_cluster_stats()
+    bot.server_count_publisher.notify()
 
 
 @bot.event
 async def on_ready():
     bot.invite_url = discord.utils.oauth_url(bot.user.id, permissions=discord.Permissions(270336))
+    await bot.publish_cluster_stats()
 
-    activity = discord.Activity(name=f"for prefix k; in {len(bot.guilds)} servers",
+    activity = discord.Activity(name=f"for prefix k; in {bot.guild_count} servers",
                                 type=discord.ActivityType.watching)
     await bot.change_presence(activity=activity)
 
@@ -115,58 +141,45 @@ Guilds:     {len(bot.guilds)}
 Members:    {sum(1 for _ in bot.get_all_members())}
 Channels:   {sum(1 for _ in bot.get_all_channels())}
 Python:     {python_version()}
-discord.py: {get_distribution('discord.py').version}
+discord.py: {pkg_resources.get_distribution('discord.py').version}
 Test Bot:   {testing}
 ---------------
 """)
 
-    while bot.logs is None:
-        await asyncio.sleep(1)
-        bot.logs = bot.get_channel(382780308610744331)
-    await bot.logs.send(embed=e)
+    bot.log_sink.log(embed=e)
+
+    bot.startup_timeline.mark("ready")
+    await bot.save_startup_timeline()
+
+    # Import what the cogs deferred now, rather than on the first command that needs it
+    await bot.loop.run_in_executor(None, cc.load_lazy_modules)
 
 
 @bot.event
 async def on_resumed():
-    if bot.latest_message_time > datetime.utcnow() + timedelta(seconds=30):
+    downtime = bot.gateway_stats.pop_downtime()
+    if downtime is not None and downtime[1] > 30:
+        down_since, seconds = downtime
         em = discord.Embed(
             title=f"Resumed @ {datetime.utcnow().strftime('%H:%M:%S')}",
-            description=f"Down since: {datetime.utcnow().strftime('%H:%M:%S')}",
+            description=f"Down since: {down_since.strftime('%H:%M:%S')} ({seconds:.0f} seconds)",
             colour=discord.Colour.red())
-        await bot.logs.send(embed=em)
-
-
-@bot.event
-async def on_socket_raw_receive(_):
-    bot.latest_message_time = datetime.utcnow()
+        bot.log_sink.log(embed=em)
 
 
 @bot.event
 async def on_message(message: discord.Message):
     if bot.database is None or not bot.database.ready or message.author.bot:
         return
-    if " && " in message.content:
-        cmds_run_before = []
-        failed_to_run = {}
-        messages = message.content.split(" && ")
-        for msg in messages:
-            message.content = msg
-            ctx = await bot.get_context(message, cls=cc.KernContext)
-            if ctx.valid:
-                if msg.strip(ctx.prefix) not in cmds_run_before:
-                    await bot.invoke(ctx)
-                    cmds_run_before.append(msg.strip(ctx.prefix))
-                else:
-                    failed_to_run[msg.strip(ctx.prefix)] = "This command has been at least once before."
-            else:
-                if ctx.prefix is not None:
-                    failed_to_run[msg.strip(ctx.prefix)] = "Command not found."
-
-        if failed_to_run and len(failed_to_run) != len(message.content.split(" && ")):
-            errors = ""
-            for fail, reason in failed_to_run.items():
-                errors += f"{fail}: {reason}\n"
-            await ctx.error(f"```{errors}```", "These failed to run:")
+    if not any(bot.could_be_command(message, msg) for msg in message.content.split(cc.CHAIN_SEPARATOR)):
+        bot.prefilter_stats["rejected"] += 1
+        return
+    bot.prefilter_stats["passed"] += 1
+
+    if cc.CHAIN_SEPARATOR in message.content:
+        chain = await cc.CommandChain.from_message(bot, message)
+        await chain.invoke(bot, bot.chain_concurrency)
+        await chain.report_failures()
 
     else:
         # is a command returned